@@ -0,0 +1,38 @@
+"""Materialize habit reset and streak deadlines
+
+Adds next_reset_at and streak_expires_at with (is_archived, deadline)
+indexes, so the reset engine range-scans only habits that are due. Existing
+rows start without deadlines; the reset engine fills them in on start-up.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("habits") as batch_op:
+        batch_op.add_column(sa.Column("next_reset_at", sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column("streak_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_habits_reset_due", "habits", ["is_archived", "next_reset_at"])
+    op.create_index("ix_habits_streak_due", "habits", ["is_archived", "streak_expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_habits_streak_due", table_name="habits")
+    op.drop_index("ix_habits_reset_due", table_name="habits")
+    with op.batch_alter_table("habits") as batch_op:
+        batch_op.drop_column("streak_expires_at")
+        batch_op.drop_column("next_reset_at")
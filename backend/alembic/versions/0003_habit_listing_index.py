@@ -0,0 +1,28 @@
+"""Index for keyset pagination of the habit list
+
+Adds (user_id, is_archived, created_at, id), the order GET /api/habits pages
+in.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_habits_user_listing", "habits", ["user_id", "is_archived", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_habits_user_listing", table_name="habits")
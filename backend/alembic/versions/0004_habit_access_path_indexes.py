@@ -0,0 +1,49 @@
+"""Indexes for the habit query patterns
+
+Adds composite indexes for the per-user list filters (category, frequency,
+completed) and a unique (habit_id, date) index on habit_logs, which also
+serves per-habit date range scans. Duplicate logs are collapsed to the
+earliest row first so the unique index can be built.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_habits_user_category", "habits", ["user_id", "category", "is_archived"])
+    op.create_index("ix_habits_user_frequency", "habits", ["user_id", "frequency", "is_archived"])
+    op.create_index("ix_habits_user_completed", "habits", ["user_id", "completed", "is_archived"])
+
+    op.execute(
+        "DELETE FROM habit_logs WHERE id NOT IN "
+        "(SELECT MIN(id) FROM habit_logs GROUP BY habit_id, date)"
+    )
+    op.create_index("uq_habit_logs_habit_date", "habit_logs", ["habit_id", "date"], unique=True)
+
+    if op.get_bind().dialect.name == "sqlite":
+        # Rows stamped by CURRENT_TIMESTAMP lack the microseconds SQLAlchemy
+        # writes; align them so keyset cursors compare equal on ties
+        op.execute(
+            "UPDATE habits SET created_at = created_at || '.000000' "
+            "WHERE length(created_at) = 19"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_habit_logs_habit_date", table_name="habit_logs")
+    op.drop_index("ix_habits_user_completed", table_name="habits")
+    op.drop_index("ix_habits_user_frequency", table_name="habits")
+    op.drop_index("ix_habits_user_category", table_name="habits")
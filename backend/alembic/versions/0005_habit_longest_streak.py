@@ -0,0 +1,33 @@
+"""Track the longest streak per habit
+
+Streaks are now derived from habit_logs. Run app/db/recompute_streaks.py
+after upgrading to rebuild current and longest streaks from existing logs.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("habits") as batch_op:
+        batch_op.add_column(
+            sa.Column("longest_streak", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("habits") as batch_op:
+        batch_op.drop_column("longest_streak")
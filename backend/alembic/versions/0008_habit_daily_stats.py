@@ -0,0 +1,42 @@
+"""Daily habit statistics rollup
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by app/db/backfill_daily_stats.py, then kept current by log writes
+    op.create_table(
+        "habit_daily_stats",
+        sa.Column("habit_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("completions", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["habit_id"], ["habits.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("habit_id", "date"),
+    )
+    op.create_index(
+        "ix_habit_daily_stats_user_date",
+        "habit_daily_stats",
+        ["user_id", "date", "habit_id", "completions"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_habit_daily_stats_user_date", table_name="habit_daily_stats")
+    op.drop_table("habit_daily_stats")
@@ -5,9 +5,10 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.auth import token_claims
 from app.core.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token
-from app.db.session import get_session
+from app.core.security import password_hasher, create_access_token
+from app.db.session import get_write_session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
 
@@ -20,8 +21,13 @@ async def authenticate_user(email: str, password: str, db: AsyncSession) -> Any:
     
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Upgrade hashes created with an older cost factor
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 @router.post(
@@ -36,6 +42,7 @@ async def authenticate_user(email: str, password: str, db: AsyncSession) -> Any:
                     "example": {
                         "email": "user@example.com",
                         "full_name": "John Doe",
+                        "timezone": "Europe/Berlin",
                         "id": 1,
                         "created_at": "2024-02-13T12:00:00"
                     }
@@ -54,7 +61,7 @@ async def authenticate_user(email: str, password: str, db: AsyncSession) -> Any:
 )
 async def register(
     user_in: UserCreate,
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_write_session)
 ) -> Any:
     """
     Register a new user.
@@ -69,8 +76,9 @@ async def register(
     
     user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
-        full_name=user_in.full_name
+        hashed_password=await password_hasher.hash(user_in.password),
+        full_name=user_in.full_name,
+        timezone=user_in.timezone
     )
     db.add(user)
     await db.commit()
@@ -104,7 +112,7 @@ async def register(
 )
 async def login(
     user_credentials: UserLogin = Body(...),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_write_session)
 ) -> Any:
     """
     Login to get access token
@@ -119,6 +127,6 @@ async def login(
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=token_claims(user), expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
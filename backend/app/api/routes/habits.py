@@ -1,110 +1,154 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+import base64
+import json
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from datetime import datetime, timedelta, timezone
-import pytz
+from sqlalchemy import select, insert, update, delete, and_, or_, not_
+from datetime import date, datetime, timedelta, timezone
 
-from app.db.session import get_session
-from app.core.auth import get_current_user
+from app.db.session import get_read_session, get_write_session
+from app.core.auth import get_current_user, get_streaming_user
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.core.http_cache import cache_headers, etag_matches, not_modified, query_fingerprint, weak_etag
+from app.core.timezones import to_local
 from app.models.habit import Habit
 from app.models.user import User
 from app.schemas.user import UserResponse
+from app.services.habit_batch import apply_habit_batch
+from app.services.habit_events import habit_events, publish_habit_event
+from app.services.habit_logs import completion_history, record_completion, record_uncompletion
+from app.services.habit_insights import get_habit_insights
+from app.services.habit_recommendations import RECOMMENDATION_FIELDS, invalidate_recommendations
+from app.services.habit_schedule import load_due_windows
+from app.services.habit_stats import compute_habit_stats
+from app.services.habit_summary import get_habit_summary
+from app.services.habit_reset import reset_due_habits, reset_deadlines
+from app.services.habit_versions import bump_habits_version, get_habits_version
+from app.services.streaks import advance_streak, last_completion_on_or_before, rebuild_habit_streak
 from app.schemas.habit import (
     HabitCreate,
     HabitResponse,
     HabitUpdate,
     HabitCategory,
     HabitFrequency,
+    HabitHistoryBucket,
+    HabitHistoryResponse,
+    HabitSummaryResponse,
+    HabitStatsResponse,
+    HabitInsightsResponse,
+    HabitBatchAction,
+    HabitBatchRequest,
+    HabitBatchResponse,
     ResetResponse,
     ArchiveResponse
 )
 
 router = APIRouter()
 
+# Batch actions that cannot change recommendation queries
+COMPLETION_ACTIONS = frozenset({HabitBatchAction.COMPLETE, HabitBatchAction.UNCOMPLETE})
+
+# Columns read by list_habits, in HabitResponse field order
+HABIT_RESPONSE_COLUMNS = tuple(getattr(Habit, name) for name in HabitResponse.model_fields)
+
+def encode_cursor(habit: Habit) -> str:
+    """Opaque keyset cursor pointing just past `habit` in list order"""
+    raw = json.dumps([habit.created_at.isoformat(), habit.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, habit_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(habit_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def habit_event_data(habit) -> dict:
+    return {"habit_id": habit.id, "habit": HabitResponse.model_validate(habit).model_dump(mode="json")}
+
 @router.post("/reset", response_model=ResetResponse)
 async def reset_habits(
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_write_session)
 ):
     """
-    Reset habits based on their frequency and last completion time.
+    Reset the current user's habits based on their frequency and last completion time.
     Daily habits reset every day, weekly habits reset every week,
     and monthly habits reset every month.
+
+    The background reset engine does this for all users at every period
+    boundary; this endpoint forces an immediate reset for one user.
     """
-    now = datetime.now(timezone.utc)
-    reset_count = 0
+    summary = await reset_due_habits(db, user_id=current_user.id)
+    await db.commit()
+    await summary.publish()
     
-    # Get all active habits for the user
-    result = await db.execute(
-        select(Habit).where(
-            Habit.user_id == current_user.id,
-            Habit.is_archived == False
-        )
+    return ResetResponse(
+        reset_count=summary.reset_count,
+        message=f"Reset {summary.reset_count} habits"
     )
-    habits = result.scalars().all()
-    
-    for habit in habits:
-        should_reset = False
-        last_completed = habit.last_completed or habit.created_at
-        
-        # Convert to UTC for consistent comparison
-        if last_completed.tzinfo is None:
-            last_completed = last_completed.replace(tzinfo=timezone.utc)
-        
-        # Check if habit needs to be reset based on frequency
-        if habit.frequency == "daily":
-            # Reset if last completion was not today
-            should_reset = last_completed.date() < now.date()
-            
-        elif habit.frequency == "weekly":
-            # Reset if last completion was in a different week
-            week_start = now - timedelta(days=now.weekday())
-            should_reset = last_completed.date() < week_start.date()
-            
-        elif habit.frequency == "monthly":
-            # Reset if last completion was in a different month
-            should_reset = (
-                last_completed.year != now.year or 
-                last_completed.month != now.month
-            )
-        
-        if should_reset and habit.completed:
-            habit.completed = False
-            reset_count += 1
-            
-            # Only reset streak if they missed the last period
-            time_diff = now - last_completed
-            if (habit.frequency == "daily" and time_diff.days > 1) or \
-               (habit.frequency == "weekly" and time_diff.days > 7) or \
-               (habit.frequency == "monthly" and time_diff.days > 31):
-                if habit.streak > 0:
-                    habit.streak = 0
-    
-    if reset_count > 0:
-        await db.commit()
+
+@router.post("/batch", response_model=HabitBatchResponse)
+async def batch_update_habits(
+    batch: HabitBatchRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_write_session)
+):
+    """
+    Apply completions, updates, archives and deletes queued by an offline client.
+
+    Operations are applied in `client_timestamp` order. Each operation gets
+    its own result in request order; a failed operation (for example an
+    unknown habit) does not roll back the others.
+    """
+    # One transaction with bulk statements instead of a request and commit per change
+    results = await apply_habit_batch(db, current_user.id, current_user.timezone, batch.operations)
+    await db.commit()
+    if any(operation.action not in COMPLETION_ACTIONS for operation in batch.operations):
+        invalidate_recommendations(current_user.id)
     
-    return ResetResponse(
-        reset_count=reset_count,
-        message=f"Reset {reset_count} habits"
+    for result in results:
+        if result.habit is not None:
+            await publish_habit_event(current_user.id, "habit.updated", {
+                "habit_id": result.habit_id,
+                "habit": result.habit.model_dump(mode="json"),
+            })
+        elif result.status == 204:
+            await publish_habit_event(current_user.id, "habit.deleted", {"habit_id": result.habit_id})
+    
+    failed = sum(1 for result in results if result.status >= 400)
+    return HabitBatchResponse(
+        applied=len(results) - failed,
+        failed=failed,
+        results=results
     )
 
 @router.get("", response_model=List[HabitResponse])
 async def list_habits(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
     include_archived: bool = Query(False),
     category: Optional[HabitCategory] = None,
     frequency: Optional[HabitFrequency] = None,
     completed: Optional[bool] = None,
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Retrieve habits for the current user with optional filtering.
     """
-    # First reset habits if needed
-    await reset_habits(current_user, db)
+    # The weak ETag is built from the user's habits version and the query
+    # string, so a matching If-None-Match costs one primary key lookup.
+    # Read the version before the habits: a write landing in between then
+    # yields an ETag older than the data, which only costs one extra 200
+    version = await get_habits_version(db, current_user.id)
+    etag = weak_etag(f"u{current_user.id}", f"v{version}", query_fingerprint(request))
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
     conditions = [Habit.user_id == current_user.id]
     
@@ -117,51 +161,202 @@ async def list_habits(
     if completed is not None:
         conditions.append(Habit.completed == completed)
     
+    # Pages are ordered newest first; a cursor (the previous page's
+    # X-Next-Cursor header) seeks past the last row in constant time and
+    # replaces `skip`
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        conditions.append(or_(
+            Habit.created_at < cursor_created_at,
+            and_(Habit.created_at == cursor_created_at, Habit.id < cursor_id)
+        ))
+        skip = 0
+    
     query = (
-        select(Habit)
+        select(*HABIT_RESPONSE_COLUMNS)
         .where(and_(*conditions))
-        .order_by(Habit.created_at.desc())
+        .order_by(Habit.created_at.desc(), Habit.id.desc())
         .offset(skip)
         .limit(limit)
     )
     
+    # Only the HabitResponse columns are selected; the rows already match it,
+    # so they are encoded with orjson as-is instead of validated field by field
     result = await db.execute(query)
-    habits = result.scalars().all()
+    habits = result.all()
+    
+    headers = cache_headers(etag)
+    if len(habits) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(habits[-1])
+    
+    return ORJSONResponse([habit._asdict() for habit in habits], headers=headers)
+
+@router.get("/summary", response_model=HabitSummaryResponse)
+async def get_habits_summary(
+    request: Request,
+    response: Response,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Dashboard summary: habit counts by category, frequency and completion,
+    plus streak statistics.
+    """
+    # One grouped query, cached per user until the next habit write, with the
+    # same version ETag as the habit list
+    version = await get_habits_version(db, current_user.id)
+    etag = weak_etag(f"u{current_user.id}", f"v{version}", "summary")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    summary = await get_habit_summary(db, current_user.id, version)
+    response.headers.update(cache_headers(etag))
+    return summary
+
+@router.get("/stats", response_model=HabitStatsResponse)
+async def get_habits_stats(
+    request: Request,
+    response: Response,
+    start: Optional[date] = Query(None, alias="from", description="First day, defaults to 29 days before `to`"),
+    end: Optional[date] = Query(None, alias="to", description="Last day, defaults to today"),
+    bucket: HabitHistoryBucket = Query(HabitHistoryBucket.WEEK),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Completion counts and rates over a date range: overall, per habit, per
+    category and per day, week or month.
+
+    Defaults to the last 30 days of the user's local calendar.
+    """
+    # Reads the habit_daily_stats rollup, at most one row per habit and day,
+    # instead of the raw logs
+    today = to_local(datetime.now(timezone.utc), current_user.timezone).date()
+    end = end or today
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    
+    # Today is part of the tag: default ranges and the periods that count as
+    # scheduled move at midnight
+    version = await get_habits_version(db, current_user.id)
+    etag = weak_etag(f"u{current_user.id}", f"v{version}", "stats", today, start, end, bucket.value)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    stats = await compute_habit_stats(db, current_user.id, current_user.timezone, today, start, end, bucket)
+    response.headers.update(cache_headers(etag))
+    return stats
+
+@router.get("/insights", response_model=HabitInsightsResponse)
+async def get_habits_insights(
+    request: Request,
+    response: Response,
+    start: Optional[date] = Query(None, alias="from", description="First day, defaults to 364 days before `to`"),
+    end: Optional[date] = Query(None, alias="to", description="Last day, defaults to today"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Completion rate, best time of day, weekday heatmap and consistency score,
+    overall and per habit.
+
+    Defaults to the last 365 days of the user's local calendar.
+    """
+    # The logs in the window are read as integer columns in one query and the
+    # metrics are computed with NumPy (see app/services/habit_insights.py)
+    today = to_local(datetime.now(timezone.utc), current_user.timezone).date()
+    end = end or today
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    
+    version = await get_habits_version(db, current_user.id)
+    etag = weak_etag(f"u{current_user.id}", f"v{version}", "insights", today, start, end)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    return habits
+    insights = await get_habit_insights(db, current_user.id, current_user.timezone, today, start, end)
+    response.headers.update(cache_headers(etag))
+    return insights
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_habit_events(
+    request: Request,
+    current_user: UserResponse = Depends(get_streaming_user)
+):
+    """
+    Server-sent events for changes to the current user's habits, from any device.
+
+    Events: `ready` once subscribed, `habit.created` and `habit.updated` (the
+    full habit), `habit.archived`, `habit.deleted`, `habits.reset` (ids of
+    un-completed habits and lost streaks) and `resync` when the client fell
+    too far behind and should refetch. An idle stream holds no database
+    connection and only sends a keep-alive comment every
+    HABIT_EVENTS_HEARTBEAT_SECONDS.
+    """
+    async def frames():
+        async with habit_events.subscribe(current_user.id) as subscription:
+            yield "event: ready\ndata: {}\n\n"
+            while not await request.is_disconnected():
+                frame = await subscription.next_frame(settings.HABIT_EVENTS_HEARTBEAT_SECONDS)
+                yield frame if frame is not None else ": keep-alive\n\n"
+    
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("", response_model=HabitResponse, status_code=201)
 async def create_habit(
     habit: HabitCreate,
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_write_session)
 ):
     """
     Create a new habit for the current user.
     """
-    db_habit = Habit(
-        user_id=current_user.id,
-        streak=0,
-        completed=False,
-        is_archived=False,
-        **habit.model_dump()
+    # A single INSERT ... RETURNING, so no refresh is needed after the commit
+    db_habit = await db.scalar(
+        insert(Habit)
+        .values(
+            user_id=current_user.id,
+            streak=0,
+            longest_streak=0,
+            completed=False,
+            is_archived=False,
+            # Nothing to reset until the habit is first completed
+            next_reset_at=None,
+            streak_expires_at=None,
+            **habit.model_dump()
+        )
+        .returning(Habit)
     )
-    
-    db.add(db_habit)
+    await bump_habits_version(db, current_user.id)
     await db.commit()
-    await db.refresh(db_habit)
+    invalidate_recommendations(current_user.id)
+    await publish_habit_event(current_user.id, "habit.created", habit_event_data(db_habit))
     
     return db_habit
 
 @router.get("/{habit_id}", response_model=HabitResponse)
 async def get_habit(
     habit_id: int,
+    request: Request,
+    response: Response,
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Retrieve a specific habit by ID.
     """
+    # Same per-user version ETags as the list
+    version = await get_habits_version(db, current_user.id)
+    etag = weak_etag(f"u{current_user.id}", f"v{version}", f"h{habit_id}")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     result = await db.execute(
         select(Habit).where(
             Habit.id == habit_id,
@@ -173,50 +368,144 @@ async def get_habit(
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     
+    response.headers.update(cache_headers(etag))
     return habit
 
+@router.get("/{habit_id}/history", response_model=HabitHistoryResponse)
+async def get_habit_history(
+    habit_id: int,
+    start: Optional[date] = Query(None, alias="from", description="First day, defaults to 364 days before `to`"),
+    end: Optional[date] = Query(None, alias="to", description="Last day, defaults to today"),
+    bucket: HabitHistoryBucket = Query(HabitHistoryBucket.DAY),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Completion history of a habit, aggregated per day, week or month.
+
+    Defaults to the last 365 days of the user's local calendar, enough for a
+    yearly heatmap.
+    """
+    today = to_local(datetime.now(timezone.utc), current_user.timezone).date()
+    end = end or today
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    
+    windows = await load_due_windows(db, current_user.id, current_user.timezone, today, start, end, habit_id)
+    if not windows:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    
+    habit, first, last = windows[0]
+    points = await completion_history(db, habit, first, last, today, start, end, bucket)
+    
+    return HabitHistoryResponse(
+        habit_id=habit_id,
+        bucket=bucket,
+        start=start,
+        end=end,
+        total_completions=sum(point.completions for point in points),
+        points=points
+    )
+
 @router.put("/{habit_id}", response_model=HabitResponse)
 async def update_habit(
     habit_id: int,
     habit_update: HabitUpdate,
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_write_session)
 ):
     """
     Update a specific habit by ID.
     """
-    result = await db.execute(
-        select(Habit).where(
-            Habit.id == habit_id,
-            Habit.user_id == current_user.id
+    # Plain field edits are a single UPDATE ... RETURNING. Completion and
+    # frequency changes read the habit first, since streaks and reset
+    # deadlines depend on its current state.
+    update_data = habit_update.model_dump(exclude_unset=True)
+    owned = and_(Habit.id == habit_id, Habit.user_id == current_user.id)
+    
+    if update_data and not update_data.keys() & {'completed', 'frequency'}:
+        habit = await db.scalar(
+            update(Habit)
+            .where(owned)
+            .values(**update_data)
+            .returning(Habit)
+            .execution_options(synchronize_session=False)
         )
-    )
-    habit = result.scalar_one_or_none()
+        if not habit:
+            raise HTTPException(status_code=404, detail="Habit not found")
+        await bump_habits_version(db, current_user.id)
+        await db.commit()
+        if update_data.keys() & RECOMMENDATION_FIELDS:
+            invalidate_recommendations(current_user.id)
+        await publish_habit_event(current_user.id, "habit.updated", habit_event_data(habit))
+        return habit
+    
+    habit = await db.scalar(select(Habit).where(owned))
     
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     
     # Update habit attributes
-    update_data = habit_update.model_dump(exclude_unset=True)
     
-    # Handle completion and last_completed
+    # Handle completion and last_completed; logs and streaks use the user's local calendar
+    now = datetime.now(timezone.utc)
+    local_now = to_local(now, current_user.timezone)
+    today = local_now.date()
+    completed_now = update_data.get('completed') is True
     if 'completed' in update_data:
+        # Log queries run before the habit is mutated, so autoflush has nothing
+        # to write and the habit is updated once, at commit
         if update_data['completed']:
+            previous_completion = await last_completion_on_or_before(db, habit.id, today)
+            await record_completion(db, current_user.id, habit.id, local_now)
+            habit.streak, habit.longest_streak = advance_streak(
+                HabitFrequency(habit.frequency),
+                habit.streak or 0,
+                habit.longest_streak or 0,
+                previous_completion,
+                today
+            )
             habit.completed = True
-            habit.last_completed = datetime.now(timezone.utc)
-            habit.streak += 1
+            habit.last_completed = now
         else:
+            if habit.completed and habit.last_completed:
+                await record_uncompletion(
+                    db, habit.id, to_local(habit.last_completed, current_user.timezone).date()
+                )
+            # Don't reset last_completed when unchecking; streaks come from the log
+            await rebuild_habit_streak(db, habit, today, current_user.timezone)
             habit.completed = False
-            # Don't reset last_completed when unchecking to preserve streak calculation
-            habit.streak = max(0, habit.streak - 1)
     
     # Update other fields
+    frequency_changed = update_data.get('frequency', habit.frequency) != habit.frequency
     for key, value in update_data.items():
         if key != 'completed':  # Skip completed as it's handled above
             setattr(habit, key, value)
     
+    # Streaks count periods, so a new frequency recounts them from the log
+    if frequency_changed:
+        await rebuild_habit_streak(db, habit, today, current_user.timezone)
+    
+    # Keep the materialized reset deadlines in step with completion and frequency
+    if 'completed' in update_data or 'frequency' in update_data:
+        if habit.completed:
+            habit.next_reset_at, habit.streak_expires_at = reset_deadlines(
+                HabitFrequency(habit.frequency),
+                now if completed_now else (habit.last_completed or now),
+                current_user.timezone
+            )
+        else:
+            habit.next_reset_at = None
+            if habit.streak == 0:
+                habit.streak_expires_at = None
+    
+    await bump_habits_version(db, current_user.id)
+    # Habit uses eager_defaults, so the flush fetches updated_at via RETURNING
     await db.commit()
-    await db.refresh(habit)
+    if update_data.keys() & RECOMMENDATION_FIELDS:
+        invalidate_recommendations(current_user.id)
+    await publish_habit_event(current_user.id, "habit.updated", habit_event_data(habit))
     
     return habit
 
@@ -224,27 +513,35 @@ async def update_habit(
 async def toggle_archive_habit(
     habit_id: int,
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_write_session)
 ):
     """
     Toggle the archive status of a habit (archive or unarchive).
     """
+    # The toggle happens in the UPDATE itself, so concurrent toggles never lose an update
     result = await db.execute(
-        select(Habit).where(
+        update(Habit)
+        .where(
             Habit.id == habit_id,
             Habit.user_id == current_user.id
         )
+        .values(is_archived=not_(Habit.is_archived))
+        .returning(Habit.id, Habit.title, Habit.is_archived)
+        .execution_options(synchronize_session=False)
     )
-    habit = result.scalar_one_or_none()
+    habit = result.one_or_none()
     
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     
-    # Toggle archive status
-    habit.is_archived = not habit.is_archived
-    action = "archived" if habit.is_archived else "unarchived"
-    
+    await bump_habits_version(db, current_user.id)
     await db.commit()
+    invalidate_recommendations(current_user.id)
+    await publish_habit_event(current_user.id, "habit.archived", {
+        "habit_id": habit.id,
+        "is_archived": habit.is_archived,
+    })
+    action = "archived" if habit.is_archived else "unarchived"
     
     return ArchiveResponse(
         id=habit.id,
@@ -257,23 +554,28 @@ async def toggle_archive_habit(
 async def delete_habit(
     habit_id: int,
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_write_session)
 ):
     """
     Permanently delete a habit by ID.
     """
-    result = await db.execute(
-        select(Habit).where(
+    # Its logs are removed by the ON DELETE CASCADE foreign key
+    deleted_id = await db.scalar(
+        delete(Habit)
+        .where(
             Habit.id == habit_id,
             Habit.user_id == current_user.id
         )
+        .returning(Habit.id)
+        .execution_options(synchronize_session=False)
     )
-    habit = result.scalar_one_or_none()
     
-    if not habit:
+    if deleted_id is None:
         raise HTTPException(status_code=404, detail="Habit not found")
     
-    await db.delete(habit)
+    await bump_habits_version(db, current_user.id)
     await db.commit()
+    invalidate_recommendations(current_user.id)
+    await publish_habit_event(current_user.id, "habit.deleted", {"habit_id": habit_id})
     
     return None
\ No newline at end of file
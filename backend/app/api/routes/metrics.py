@@ -0,0 +1,54 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth import user_cache
+from app.core.metrics import CallbackMetric, register, render_prometheus
+from app.core.security import password_hasher
+from app.services.habit_events import habit_events
+from app.services.habit_recommendations import recommendation_cache
+from app.services.habit_summary import summary_cache
+
+router = APIRouter()
+
+# Process-wide state that is already tracked elsewhere, read at scrape time
+CACHES = {"user": user_cache, "habit_summary": summary_cache, "recommendations": recommendation_cache}
+
+register(CallbackMetric(
+    "cache_hits_total", "In-process cache hits", "counter", ("cache",),
+    lambda: {(name,): cache.hits for name, cache in CACHES.items()}
+))
+register(CallbackMetric(
+    "cache_misses_total", "In-process cache misses, including expired entries", "counter", ("cache",),
+    lambda: {(name,): cache.misses for name, cache in CACHES.items()}
+))
+register(CallbackMetric(
+    "cache_entries", "Entries currently held by in-process caches", "gauge", ("cache",),
+    lambda: {(name,): len(cache) for name, cache in CACHES.items()}
+))
+register(CallbackMetric(
+    "cache_max_entries", "Capacity of in-process caches", "gauge", ("cache",),
+    lambda: {(name,): cache.maxsize for name, cache in CACHES.items()}
+))
+register(CallbackMetric(
+    "password_hash_pending", "Password hash and verify jobs queued or running", "gauge", (),
+    lambda: {(): password_hasher.pending}
+))
+register(CallbackMetric(
+    "habit_event_subscribers", "Open habit change streams on this worker", "gauge", (),
+    lambda: {(): habit_events.subscriber_count()}
+))
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Prometheus scrape endpoint.
+
+    Metrics are per worker process and not aggregated; with several workers
+    on one port each scrape reaches one of them, so run one worker per
+    scrape target for accurate series. The endpoint is unauthenticated, so restrict it
+    to the monitoring network at the proxy.
+    """
+    return PlainTextResponse(
+        render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
\ No newline at end of file
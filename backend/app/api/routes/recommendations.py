@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_current_user
+from app.core.http_cache import cache_headers, etag_matches, not_modified, weak_etag
+from app.db.session import get_read_session
+from app.schemas.recommendation import RecommendationsResponse
+from app.schemas.user import UserResponse
+from app.services.habit_recommendations import get_recommendations, load_query_habits
+
+router = APIRouter()
+
+@router.get("", response_model=RecommendationsResponse)
+async def get_habit_recommendations(
+    request: Request,
+    response: Response,
+    limit: int = Query(5, ge=1, le=20, description="Number of passages to return"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Guidance passages matching the user's active habits.
+
+    The most recently created active habits (up to RAG_MAX_QUERY_HABITS) are
+    each used as a query against the local vector index built from the
+    habit guidance corpus. Results are cached by a fingerprint of that habit
+    set (see app/services/habit_recommendations.py), which is also the ETag,
+    so repeat loads cost one habits query and no retrieval. Returns an empty
+    list for users without active habits.
+    """
+    habits = await load_query_habits(db, current_user.id)
+    try:
+        fingerprint, recommendations = await get_recommendations(current_user.id, habits, limit)
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="Recommendation index is not built")
+
+    etag = weak_etag("r", fingerprint)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    return RecommendationsResponse(recommendations=recommendations)
\ No newline at end of file
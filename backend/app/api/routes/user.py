@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Security
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any
 
+from app.schemas.user import UserResponse, UserUpdate
+from app.core.auth import get_current_user, token_claims
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import get_write_session
 from app.models.user import User
-from app.schemas.user import UserResponse
-from app.core.security import get_current_user
-from app.db.session import get_session
 
 router = APIRouter()
-security = HTTPBearer()
 
 @router.get("",
     response_model=UserResponse,
@@ -21,6 +22,7 @@ security = HTTPBearer()
                     "example": {
                         "email": "user@example.com",
                         "full_name": "John Doe",
+                        "timezone": "Europe/Berlin",
                         "id": 1,
                         "created_at": "2024-02-13T12:00:00"
                     }
@@ -38,12 +40,43 @@ security = HTTPBearer()
     }
 )
 async def get_current_user_profile(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-    db: AsyncSession = Depends(get_session)
+    current_user: UserResponse = Depends(get_current_user)
 ) -> Any:
     """
     Get current user profile.
     Requires JWT token in Authorization header.
     """
-    user = await get_current_user(credentials.credentials, db)
-    return UserResponse.model_validate(user)
\ No newline at end of file
+    return current_user
+
+@router.put("", response_model=UserResponse)
+async def update_current_user_profile(
+    user_update: UserUpdate,
+    response: Response,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_write_session)
+) -> Any:
+    """
+    Update the current user's name or timezone.
+    A new timezone applies to resets and streaks from the next completion on.
+
+    With stateless tokens the response carries a new access token in the
+    X-Access-Token header; tokens issued before the update keep the old
+    name and timezone until they expire.
+    """
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    for key, value in user_update.model_dump(exclude_unset=True, exclude_none=True).items():
+        setattr(user, key, value)
+
+    await db.commit()
+    await db.refresh(user)
+
+    # Stateless tokens carry the profile, so the caller's token is now stale
+    if settings.AUTH_STATELESS_TOKENS:
+        response.headers["X-Access-Token"] = create_access_token(
+            data=token_claims(user),
+            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+    return user
\ No newline at end of file
@@ -1,3 +1,5 @@
+import hashlib
+import time
 from typing import Optional
 from datetime import datetime
 
@@ -5,10 +7,13 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.session import get_session
+from app.core.instrumentation import timed
+from app.core.timezones import DEFAULT_TIMEZONE
+from app.db.session import get_read_session, read_session
 from app.models.user import User
 from app.schemas.user import UserResponse
 
@@ -17,48 +22,138 @@ oauth2_scheme = OAuth2PasswordBearer(
     scheme_name="JWT"
 )
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_session)
-) -> UserResponse:
+# Validated users keyed by (token subject, token hash). An entry never outlives
+# its token and is dropped whenever the user row is updated or deleted.
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+def token_claims(user: User) -> dict:
     """
-    Get the current user from the JWT token
+    Build the JWT claims for a user's access token.
+
+    With AUTH_STATELESS_TOKENS enabled the token also carries the user's id and
+    profile, so get_current_user can authenticate without any lookup. The
+    profile is then only as fresh as the token: PUT /api/user returns a new
+    token, and other tokens keep the old name and timezone until they expire
+    (ACCESS_TOKEN_EXPIRE_MINUTES).
     """
-    credentials_exception = HTTPException(
+    claims = {"sub": user.email}
+    if settings.AUTH_STATELESS_TOKENS:
+        claims.update({
+            "uid": user.id,
+            "name": user.full_name,
+            "tz": user.timezone,
+            "created_at": user.created_at.isoformat(),
+        })
+    return claims
+
+def invalidate_user(email: str) -> int:
+    """Drop every cached entry for the given token subject"""
+    return user_cache.discard_where(lambda key: key[0] == email)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    # Cover both the new and the previous email in case the email itself changed
+    for email in {target.email, *inspect(target).attrs.email.history.deleted}:
+        if email:
+            invalidate_user(email)
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    Decode and validate the bearer token.
+
+    FastAPI caches dependencies per request, so the token is decoded once no
+    matter how many dependencies of a route need the claims.
+    """
     try:
         # Decode JWT
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        with timed("auth"):
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM]
+            )
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise credentials_exception()
         
         # Get expiration time
         exp = payload.get("exp")
         if exp is None:
-            raise credentials_exception
+            raise credentials_exception()
         
         # Check if token has expired
         if datetime.utcfromtimestamp(exp) < datetime.utcnow():
-            raise credentials_exception
+            raise credentials_exception()
             
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
+    
+    return payload
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_read_session)
+) -> UserResponse:
+    """
+    Get the current user from the JWT token.
+
+    This is the single auth dependency shared by every protected router and is
+    resolved once per request. A cache miss looks the user up through the
+    request's read session, which read-only routes share; routes that write
+    hold a separate write session.
+    """
+    email: str = payload["sub"]
+    
+    # Stateless tokens carry the profile themselves; the claims were validated
+    # when the token was issued and are covered by its signature
+    if settings.AUTH_STATELESS_TOKENS and "uid" in payload:
+        return UserResponse.model_construct(
+            id=payload["uid"],
+            email=email,
+            full_name=payload.get("name"),
+            timezone=payload.get("tz", DEFAULT_TIMEZONE),
+            created_at=datetime.fromisoformat(payload["created_at"]),
+        )
+    
+    cache_key = (email, hashlib.sha256(token.encode()).hexdigest())
+    cached: Optional[UserResponse] = user_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     # Get user from database
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    with timed("auth"):
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalar_one_or_none()
     
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
         
     # Convert to Pydantic model
-    return UserResponse.model_validate(user)
\ No newline at end of file
+    user_response = UserResponse.model_validate(user)
+    user_cache.set(cache_key, user_response, ttl=payload["exp"] - time.time())
+    return user_response
+
+async def get_streaming_user(
+    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_token_payload)
+) -> UserResponse:
+    """
+    get_current_user for long-lived responses such as event streams.
+
+    The lookup (if the user is not cached) uses its own short-lived session,
+    so no database connection stays checked out while the response streams.
+    """
+    async with read_session() as db:
+        return await get_current_user(token, payload, db)
\ No newline at end of file
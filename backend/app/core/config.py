@@ -1,19 +1,107 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 import os
-from typing import ClassVar
+from typing import ClassVar, Optional
 
 class Settings(BaseSettings):
     # JWT Settings
     SECRET_KEY: str = "your-secret-key-here"  # Change this in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Embed user id and profile in tokens so requests skip the user lookup
+    AUTH_STATELESS_TOKENS: bool = False
+    
+    # Cache of validated users for stateful tokens
+    USER_CACHE_MAXSIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Existing hashes are upgraded on next login when changed
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Beyond this, requests get 503
     
     # Class variable (not a field)
     PROJECT_ROOT: ClassVar[str] = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
     
     # Database settings
     DATABASE_URL: str = f"sqlite+aiosqlite:///{PROJECT_ROOT}/atomic_habits.db"
+    DB_ECHO: bool = False  # Logs every statement; development only
+    # Listing endpoints read from a replica when set; for SQLite files they
+    # otherwise use a separate read-only connection
+    READ_REPLICA_URL: Optional[str] = None
+    SQLITE_READ_ONLY_CONNECTIONS: bool = True
+    
+    # Connection pool (server databases such as postgresql+asyncpg)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite connection pragmas
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Habit reset engine
+    RESET_ENGINE_ENABLED: bool = True
+    RESET_ENGINE_MAX_INTERVAL_SECONDS: int = 3600
+    # Workers on one host elect a single engine through a lock on this file; "" = no election
+    RESET_ENGINE_LOCK_PATH: str = f"{PROJECT_ROOT}/reset_engine.lock"
+
+    # Offline sync via POST /api/habits/batch
+    HABIT_BATCH_MAX_OPERATIONS: int = 500
+    HABIT_BATCH_MAX_CLOCK_SKEW_SECONDS: int = 300  # Later client timestamps are rejected
+
+    # Cache-Control max-age for ETag-validated habit responses; 0 = always revalidate
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 0
+
+    # Cached dashboard summaries, keyed by user and habits version
+    SUMMARY_CACHE_MAXSIZE: int = 10000
+    SUMMARY_CACHE_TTL_SECONDS: int = 300
+
+    # Habit change stream (GET /api/habits/stream)
+    HABIT_EVENTS_BROKER_URL: Optional[str] = None  # redis://... to share events across workers
+    HABIT_EVENTS_QUEUE_SIZE: int = 100  # Per connection; a full queue becomes a resync event
+    HABIT_EVENTS_HEARTBEAT_SECONDS: int = 15
+
+    # Request and query instrumentation, exported at GET /metrics
+    METRICS_ENABLED: bool = True
+    METRICS_SERVER_TIMING: bool = False  # Adds a Server-Timing header to every response
+
+    # Server started by `python main.py`
+    SERVER_MODE: str = "development"  # "production": worker processes, no auto-reload
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # Production only; 0 = one per available CPU core
+    SERVER_LOOP: str = "auto"  # auto picks uvloop when installed (uvicorn[standard])
+    SERVER_HTTP: str = "auto"  # auto picks httptools when installed
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE_SECONDS: int = 5  # Keep above the proxy's idle timeout upstream
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_ACCESS_LOG: bool = True
+
+    # Start-up warm-up: pooled connections opened per engine before serving
+    WARMUP_ENABLED: bool = True
+    DB_POOL_WARM_CONNECTIONS: int = 2
+
+    # Recommendation retrieval (GET /api/recommendations)
+    RAG_INDEX_DIR: str = f"{PROJECT_ROOT}/rag_index"
+    RAG_CORPUS_DIR: str = f"{PROJECT_ROOT}/app/rag/corpus"
+    RAG_AUTO_BUILD: bool = True  # Build the index from RAG_CORPUS_DIR when it is missing
+    RAG_EMBEDDER: str = "hashing"  # "hashing" or "tfidf" (for larger corpora); used when building
+    RAG_EMBEDDING_DIM: int = 256
+    RAG_CHUNK_WORDS: int = 120
+    RAG_CHUNK_OVERLAP_WORDS: int = 20
+    RAG_IVF_NPROBE: int = 16  # IVF lists scanned per query; 0 = exact search
+    RAG_MAX_QUERY_HABITS: int = 10  # Most recent active habits used as queries
+
+    # Recommendation results, keyed by a fingerprint of the queried habit set
+    RECOMMENDATION_CACHE_MAXSIZE: int = 10000
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = 86400
+    RECOMMENDATION_CACHE_PATH: Optional[str] = None  # JSON snapshot saved on shutdown, loaded on start-up
 
     # Optional: Add this if you want to use PYTHONPATH from .env
     # PYTHONPATH: str | None = None
@@ -0,0 +1,46 @@
+import hashlib
+from typing import Dict
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+def weak_etag(*parts: object) -> str:
+    """Weak validator built from version parts, e.g. W/"u1-v42-3fa1c0de" """
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+def query_fingerprint(request: Request) -> str:
+    """Short stable hash of the query string, so each filter/page gets its own ETag"""
+    query = "&".join(sorted(request.url.query.split("&")))
+    return hashlib.blake2b(query.encode(), digest_size=6).hexdigest()
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Weak comparison of `etag` against the If-None-Match request header.
+
+    Handles lists of tags; the W/ prefix is ignored on both sides as RFC 9110
+    requires for If-None-Match. "*" is not honoured, since the check runs
+    before the resource is known to exist.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """
+    Validator and caching headers for per-user API responses.
+
+    Responses are private to the bearer token; with HTTP_CACHE_MAX_AGE_SECONDS
+    at 0, clients revalidate on every poll and get a 304 when nothing changed.
+    """
+    max_age = settings.HTTP_CACHE_MAX_AGE_SECONDS
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}" if max_age else "private, no-cache",
+        "Vary": "Authorization",
+    }
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
\ No newline at end of file
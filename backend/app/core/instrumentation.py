@@ -0,0 +1,160 @@
+"""
+Per-request latency and database instrumentation.
+
+MetricsMiddleware puts a RequestMetrics on a context variable for each HTTP
+request; SQLAlchemy cursor events add every statement's time to it, and
+`timed` blocks (authentication, response rendering) record named phases. On
+completion the request is folded into the route histograms in
+app/core/metrics.py, and with METRICS_SERVER_TIMING the breakdown is also
+returned in a Server-Timing header for browser dev tools.
+
+The middleware is pure ASGI and the hooks only call perf_counter and append
+to lists, so the overhead is a few microseconds per request and per query.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import (
+    db_query_seconds,
+    http_request_db_queries,
+    http_request_db_seconds,
+    http_request_seconds,
+    http_requests_total
+)
+
+class RequestMetrics:
+    """Query count and phase timings of the request being served"""
+
+    __slots__ = ("started", "queries", "query_seconds", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.phases: Dict[str, float] = {}
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; durations are in milliseconds"""
+        entries = [f'db;dur={self.query_seconds * 1000:.2f};desc="{self.queries} queries"']
+        entries.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items())
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+_current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request", default=None)
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to `phase` of the current request, if any"""
+    metrics = _current_request.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] = metrics.phases.get(phase, 0.0) + time.perf_counter() - start
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    db_query_seconds.observe(elapsed)
+    metrics = _current_request.get()
+    if metrics is not None:
+        metrics.queries += 1
+        metrics.query_seconds += elapsed
+
+def _handle_error(exception_context) -> None:
+    """Drop the start time of a failed statement, which gets no after event"""
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """Time every statement run through `sync_engine` (an AsyncEngine's .sync_engine)"""
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+def route_template(scope) -> str:
+    """
+    Path template of the matched route, e.g. /api/habits/{habit_id}.
+
+    Routes of included routers may only know their own part of the path
+    (FastAPI resolves router prefixes lazily), so the leading segments the
+    template does not cover are taken from the request path; router
+    prefixes in this app are literal.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = getattr(route, "path_format", None) or getattr(route, "path", "")
+    template_segments = template.split("/")[1:] if template else []
+    path_segments = scope["path"].split("/")[1:]
+    prefix = path_segments[:max(len(path_segments) - len(template_segments), 0)]
+    return "/" + "/".join(prefix + template_segments)
+
+class MetricsMiddleware:
+    """
+    Records latency, status and database usage of every HTTP request by route.
+
+    Routes are labelled by their path template (e.g. /api/habits/{habit_id}),
+    so metric cardinality stays bounded. Event streams are counted but kept
+    out of the latency histograms, since their duration is the connection
+    lifetime.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current_request.set(metrics)
+        status_code = 500
+        elapsed = None
+        streaming = False
+
+        async def send_with_metrics(message) -> None:
+            nonlocal status_code, elapsed, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - metrics.started
+                headers = message.get("headers", [])
+                streaming = any(
+                    name == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in headers
+                )
+                if self.server_timing:
+                    message = {
+                        **message,
+                        "headers": [*headers, (b"server-timing", metrics.server_timing().encode())],
+                    }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current_request.reset(token)
+            route_path = route_template(scope)
+            method = scope["method"]
+            http_requests_total.inc(method, route_path, str(status_code))
+            if not streaming:
+                if elapsed is None:
+                    elapsed = time.perf_counter() - metrics.started
+                http_request_seconds.labels(method, route_path).observe(elapsed)
+                http_request_db_queries.labels(method, route_path).observe(metrics.queries)
+                http_request_db_seconds.labels(method, route_path).observe(metrics.query_seconds)
\ No newline at end of file
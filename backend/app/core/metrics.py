@@ -0,0 +1,195 @@
+import bisect
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond queries to slow bcrypt rounds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Statements per request; anything past a handful on a read path is an N+1 suspect
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _format_labels(names: Sequence[str], values: Sequence[object], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    """
+    Cumulative latency histogram with Prometheus-style buckets.
+
+    Observations are O(log buckets) and allocation free, so it is cheap enough
+    to record on every request.
+    """
+
+    def __init__(self, name: str, description: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        cumulative = []
+        running = 0
+        for bucket_count in self.counts:
+            running += bucket_count
+            cumulative.append(running)
+        return {
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], cumulative)),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+    def samples(self, label_names: Sequence[str] = (), label_values: Sequence[object] = ()) -> List[str]:
+        lines = []
+        running = 0
+        for bound, bucket_count in zip([*map(_format_value, self.buckets), "+Inf"], self.counts):
+            running += bucket_count
+            labels = _format_labels(label_names, label_values, f'le="{bound}"')
+            lines.append(f"{self.name}_bucket{labels} {running}")
+        labels = _format_labels(label_names, label_values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(self.sum)}")
+        lines.append(f"{self.name}_count{labels} {self.count}")
+        return lines
+
+    def expose(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+            *self.samples(),
+        ]
+
+class LabeledHistogram:
+    """A Histogram per combination of label values, e.g. one per route"""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._children: Dict[Tuple, Histogram] = {}
+
+    def labels(self, *values: object) -> Histogram:
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = Histogram(self.name, self.description, self.buckets)
+        return child
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(child.samples(self.label_names, values))
+        return lines
+
+class LabeledCounter:
+    """Monotonic counter per combination of label values"""
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str]):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *values: object, amount: float = 1) -> None:
+        self._values[values] = self._values.get(values, 0) + amount
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {_format_value(value)}")
+        return lines
+
+class CallbackMetric:
+    """
+    Counter or gauge read from existing state when /metrics is scraped.
+
+    `collect` returns {label values: value}; use it for numbers that are
+    already tracked elsewhere, such as cache hit counters, so nothing extra
+    runs on the request path.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        metric_type: str,
+        label_names: Sequence[str],
+        collect: Callable[[], Dict[Tuple, float]]
+    ):
+        self.name = name
+        self.description = description
+        self.metric_type = metric_type
+        self.label_names = tuple(label_names)
+        self.collect = collect
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.metric_type}"]
+        for values, value in self.collect().items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {_format_value(value)}")
+        return lines
+
+# Metrics exported at /metrics, in exposition order
+registry: List = []
+
+def register(metric):
+    registry.append(metric)
+    return metric
+
+def render_prometheus() -> str:
+    """All registered metrics in the Prometheus text exposition format (0.0.4)"""
+    lines = []
+    for metric in registry:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+http_request_seconds = register(LabeledHistogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending its response headers",
+    ("method", "route")
+))
+http_requests_total = register(LabeledCounter(
+    "http_requests_total",
+    "Completed HTTP requests",
+    ("method", "route", "status")
+))
+http_request_db_queries = register(LabeledHistogram(
+    "http_request_db_queries",
+    "Database statements executed per request",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS
+))
+http_request_db_seconds = register(LabeledHistogram(
+    "http_request_db_seconds",
+    "Time spent in database statements per request",
+    ("method", "route")
+))
+db_query_seconds = register(Histogram(
+    "db_query_seconds",
+    "Execution time of single database statements, including background jobs"
+))
+
+password_hash_seconds = register(Histogram(
+    "password_hash_seconds",
+    "Time spent hashing new passwords, including worker pool queueing"
+))
+password_verify_seconds = register(Histogram(
+    "password_verify_seconds",
+    "Time spent verifying passwords, including worker pool queueing"
+))
\ No newline at end of file
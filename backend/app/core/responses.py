@@ -0,0 +1,20 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.core.instrumentation import timed
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    orjson serializes datetimes, dates, enums and dataclasses natively and is
+    several times faster than the standard library encoder. Routes that return
+    plain rows (see list_habits) skip response model validation entirely and
+    only pay for this encoding step.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with timed("render"):
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
\ No newline at end of file
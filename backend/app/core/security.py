@@ -1,24 +1,97 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Any
-from jose import JWTError, jwt
+from typing import Callable, Optional, Tuple
+from jose import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.core.config import settings
-from app.models.user import User
+from app.core.metrics import Histogram, password_hash_seconds, password_verify_seconds
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored one uses outdated settings"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Get password hash"""
     return pwd_context.hash(password)
 
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop in a bounded worker pool.
+
+    Each bcrypt call costs 100-300 ms of CPU, so running it inline in an async
+    handler stalls every other request on the worker. Calls beyond
+    `max_pending` in flight are rejected with 503 instead of queueing
+    without bound during a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int, executor: str = "thread"):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor_type = executor
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, histogram: Histogram, fn: Callable, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            histogram.observe(time.perf_counter() - start)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(password_hash_seconds, get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; the second item is a replacement hash when BCRYPT_ROUNDS changed"""
+        return await self._run(
+            password_verify_seconds, verify_and_update_password, password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    executor=settings.PASSWORD_HASH_EXECUTOR
+)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -32,30 +105,4 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         settings.SECRET_KEY, 
         algorithm=settings.ALGORITHM
     )
-    return encoded_jwt
-
-async def get_current_user(token: str, db: AsyncSession) -> Any:
-    """Validate JWT token and return current user"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
-    
-    if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+    return encoded_jwt
\ No newline at end of file
@@ -0,0 +1,73 @@
+import logging
+import os
+from typing import Any, Dict
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def worker_count() -> int:
+    """SERVER_WORKERS, or one worker per CPU core this process may run on"""
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    if hasattr(os, "sched_getaffinity"):
+        return max(len(os.sched_getaffinity(0)), 1)
+    return os.cpu_count() or 1
+
+def server_options() -> Dict[str, Any]:
+    """
+    uvicorn.run() options for the configured SERVER_MODE.
+
+    Development runs a single auto-reloading process. Production runs one
+    worker process per core: the API is async, so a worker per core keeps
+    every core busy without the contention of extra processes. The uvloop
+    event loop and httptools parser are used when installed; the backlog
+    absorbs connection bursts and keep-alive saves a TCP handshake per
+    request from the proxy. On shutdown workers stop accepting connections
+    and get SERVER_GRACEFUL_SHUTDOWN_SECONDS to finish in-flight requests
+    before the lifespan stops background work and disposes the engines.
+
+    Every worker runs the lifespan, so per-process state is per worker:
+    - the user, summary and recommendation caches
+    - the in-memory event broker; set HABIT_EVENTS_BROKER_URL so events,
+      including the reset engine's habits.reset, reach streams on every worker
+    - /metrics, which reports only the worker that answers the scrape; the
+      port is shared, so successive scrapes land on different workers
+    Jobs that must run once are not repeated per worker: the recommendation
+    index is built by `prepare` before the workers start, and the reset
+    engine runs only in the worker holding RESET_ENGINE_LOCK_PATH.
+    """
+    options: Dict[str, Any] = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "loop": settings.SERVER_LOOP,
+        "http": settings.SERVER_HTTP,
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEP_ALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "access_log": settings.SERVER_ACCESS_LOG,
+    }
+    if settings.SERVER_MODE == "production":
+        options["workers"] = worker_count()
+    elif settings.SERVER_MODE == "development":
+        options["reload"] = True
+    else:
+        raise ValueError(f"Unknown SERVER_MODE {settings.SERVER_MODE!r}; use 'development' or 'production'")
+    return options
+
+def prepare() -> None:
+    """One-off start-up work done in the parent process, before any worker starts"""
+    from app.rag.retrieval import retriever
+
+    try:
+        retriever.build_if_missing()
+    except (OSError, ValueError):
+        # Workers start anyway; GET /api/recommendations retries on first use
+        logger.exception("Could not build the recommendation index in %s", settings.RAG_INDEX_DIR)
+
+def run() -> None:
+    import uvicorn
+    options = server_options()
+    if "workers" in options:
+        prepare()
+    uvicorn.run("main:app", **options)
\ No newline at end of file
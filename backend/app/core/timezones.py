@@ -0,0 +1,35 @@
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+DEFAULT_TIMEZONE = "UTC"
+
+def is_valid_timezone(name: str) -> bool:
+    """Whether `name` is an IANA zone known to this system"""
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+@lru_cache(maxsize=None)
+def get_zone(name: Optional[str]) -> tzinfo:
+    """
+    Resolve an IANA zone name once per process.
+
+    Unknown or empty names fall back to UTC, so a bad stored value never
+    breaks a request or a reset run.
+    """
+    if not name or name == DEFAULT_TIMEZONE:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+def to_local(moment: datetime, zone_name: Optional[str]) -> datetime:
+    """Convert an instant to a user's local time; naive datetimes (as read back from SQLite) are UTC"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(get_zone(zone_name))
\ No newline at end of file
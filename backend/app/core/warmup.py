@@ -0,0 +1,68 @@
+"""
+Work done once per worker before it serves requests.
+
+Each step moves a one-off cost off the first requests: ORM mapper
+configuration, route dependency analysis (done while building the OpenAPI
+schema), opening pooled connections, loading the bcrypt backend, the first
+JWT round trip, compiling the user lookup statement, email validation
+tables, the zone lookups for every timezone in use and opening (or
+building) the recommendation index.
+
+The user cache is keyed by token and cannot be filled ahead of time; these
+steps make its misses as cheap as a warm worker's instead.
+"""
+import logging
+import time
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.orm import configure_mappers
+
+from app.core.auth import get_token_payload
+from app.core.config import settings
+from app.core.security import create_access_token, pwd_context
+from app.core.timezones import get_zone
+from app.db.session import engine, read_engine, read_session, warm_engine
+from app.models.user import User
+from app.rag.retrieval import retriever
+from app.schemas.user import UserResponse
+
+logger = logging.getLogger(__name__)
+
+WARMUP_EMAIL = "warmup@example.com"
+
+async def warm_up(app: FastAPI) -> float:
+    """Run every warm-up step and return the seconds spent"""
+    start = time.perf_counter()
+    configure_mappers()
+    app.openapi()
+
+    await warm_engine(engine, settings.DB_POOL_WARM_CONNECTIONS)
+    if read_engine is not engine:
+        await warm_engine(read_engine, settings.DB_POOL_WARM_CONNECTIONS)
+
+    pwd_context.handler("bcrypt").get_backend()
+    await get_token_payload(create_access_token({"sub": WARMUP_EMAIL}))
+    UserResponse(email=WARMUP_EMAIL, full_name="Warm-up", id=0, created_at=datetime.now(timezone.utc))
+
+    async with read_session() as db:
+        # Same statement as get_current_user, so its compiled form is cached
+        await db.execute(select(User).where(User.email == WARMUP_EMAIL))
+        zones = (await db.scalars(select(User.timezone).distinct())).all()
+    for zone_name in zones:
+        get_zone(zone_name)
+
+    try:
+        index = retriever.load()
+        index.search(index.embedder.embed([WARMUP_EMAIL]), 1, settings.RAG_IVF_NPROBE)
+    except FileNotFoundError:
+        logger.warning("No recommendation index in %s; GET /api/recommendations returns 503", settings.RAG_INDEX_DIR)
+    except (OSError, ValueError):
+        # A broken or half-replaced index must not keep the worker from serving;
+        # the next request retries opening it
+        logger.exception("Could not open the recommendation index in %s", settings.RAG_INDEX_DIR)
+
+    elapsed = time.perf_counter() - start
+    logger.info("Warm-up finished in %.1f ms (%d timezones)", elapsed * 1000, len(zones))
+    return elapsed
\ No newline at end of file
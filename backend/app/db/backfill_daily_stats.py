@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(backend_dir)
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.session import build_engine
+from app.services.habit_stats import backfill_daily_stats
+
+async def backfill(batch_size: int):
+    """Build the habit_daily_stats rollup from existing habit_logs rows"""
+    engine = build_engine(settings.DATABASE_URL)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    start = time.perf_counter()
+    try:
+        async with async_session() as session:
+            written = await backfill_daily_stats(session, batch_size)
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+    print(f"Backfilled {written} daily stats rows in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build habit_daily_stats from habit_logs")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Log rows per upsert")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
\ No newline at end of file
@@ -4,4 +4,5 @@ from app.db.base_class import Base
 # Import all models here for SQLAlchemy to detect them
 from app.models.user import User
 from app.models.habit import Habit
-from app.models.habit_log import HabitLog
\ No newline at end of file
+from app.models.habit_log import HabitLog
+from app.models.habit_daily_stat import HabitDailyStat
\ No newline at end of file
@@ -0,0 +1,323 @@
+"""
+Synthetic data generator for load testing.
+
+Extends the sample habits from populate_db to N users x M habits x D days of
+HabitLog history, with the matching habit_daily_stats rollup. Completions follow a per-habit rate with day-to-day
+momentum and a weekend dip, and a fixed seed makes every run reproducible.
+Rows are written with bulk executemany inserts in batches, and all users
+share one precomputed password hash.
+
+    python app/db/generate_data.py --users 1000 --habits 10 --days 100
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time as timer
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(backend_dir)
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.db.populate_db import USERS
+from app.db.session import build_engine
+from app.models.user import User
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.models.habit_daily_stat import HabitDailyStat
+from app.schemas.habit import HabitFrequency
+from app.services.habit_reset import reset_deadlines
+from app.services.streaks import streaks_from_dates
+
+# The sample daily habits plus weekly and monthly ones so every frequency is covered
+HABIT_TEMPLATES = [habit for user in USERS for habit in user["habits"]] + [
+    {
+        "title": "Meal Prep",
+        "description": "Plan and prepare meals for the week",
+        "frequency": "weekly",
+        "category": "Health",
+        "time_of_day": "17:00",
+        "reminder_time": "16:45",
+        "completion_rate": 0.65
+    },
+    {
+        "title": "Call Family",
+        "description": "Catch up with parents and siblings",
+        "frequency": "weekly",
+        "category": "Social",
+        "time_of_day": "19:00",
+        "reminder_time": "18:55",
+        "completion_rate": 0.75
+    },
+    {
+        "title": "Budget Review",
+        "description": "Review spending and savings goals",
+        "frequency": "monthly",
+        "category": "Productivity",
+        "time_of_day": "10:00",
+        "reminder_time": "09:45",
+        "completion_rate": 0.6
+    },
+]
+
+LOG_COLUMNS = ("habit_id", "date", "completed", "completion_time")
+STAT_COLUMNS = ("user_id", "habit_id", "date", "completions")
+
+def is_scheduled(frequency: str, day: date) -> bool:
+    """Weekly habits are due on Mondays and monthly habits on the 1st, as in populate_db"""
+    if frequency == "weekly":
+        return day.weekday() == 0
+    if frequency == "monthly":
+        return day.day == 1
+    return True
+
+class Calendar:
+    """
+    Scheduled days per frequency plus pre-rendered log values.
+
+    On SQLite, dates and times are pre-rendered in SQLAlchemy's storage format
+    once per day and per minute rather than once per row, so log tuples can go
+    straight to the driver's executemany.
+    """
+
+    def __init__(self, days: List[date], raw_sql: bool):
+        self.today = days[-1]
+        self.scheduled = {
+            frequency.value: [
+                (day, day.isoformat() if raw_sql else day, day.weekday() >= 5)
+                for day in days if is_scheduled(frequency.value, day)
+            ]
+            for frequency in HabitFrequency
+        }
+        minutes = [time(minute // 60, minute % 60) for minute in range(24 * 60)]
+        self.times = [t.strftime("%H:%M:%S.%f") for t in minutes] if raw_sql else minutes
+
+def generate_history(
+    rng: random.Random,
+    habit_id: int,
+    template: dict,
+    rate: float,
+    calendar: Calendar
+) -> Tuple[List[tuple], Dict[str, object]]:
+    """
+    Generate the log rows of one habit and the habit state they imply.
+
+    Completion is a two-state Markov chain around `rate`: a completed period
+    makes the next one more likely and a miss makes it less likely, which
+    produces realistic streaks. Daily habits dip on weekends. Streaks come
+    from streaks_from_dates, as recompute_streaks derives them, so a streak
+    stays alive through a miss in the period still in progress.
+    """
+    hour, minute = map(int, template["time_of_day"].split(":"))
+    scheduled_minute = hour * 60 + minute
+    after_hit = min(0.98, rate + 0.15)
+    after_miss = max(0.05, rate - 0.3)
+    daily = template["frequency"] == "daily"
+    random_value, gauss, times = rng.random, rng.gauss, calendar.times
+
+    logs, completed_days = [], []
+    completed = random_value() < rate
+    last_day = last_minute = None
+    for day, day_value, weekend in calendar.scheduled[template["frequency"]]:
+        probability = after_hit if completed else after_miss
+        if daily and weekend:
+            probability *= 0.85
+        completed = random_value() < probability
+
+        if completed:
+            # Completions cluster around the scheduled time
+            at = min(max(int(gauss(scheduled_minute, 25)), 0), 24 * 60 - 1)
+            logs.append((habit_id, day_value, True, times[at]))
+            last_day, last_minute = day, at
+            completed_days.append(day)
+        else:
+            logs.append((habit_id, day_value, False, None))
+
+    frequency = HabitFrequency(template["frequency"])
+    streak, longest, _ = streaks_from_dates(frequency, completed_days, calendar.today)
+    state = {
+        "streak": streak,
+        "longest_streak": longest,
+        "completed": False,
+        "last_completed": None,
+        "next_reset_at": None,
+        "streak_expires_at": None,
+    }
+    if last_day is not None:
+        last_completed = datetime.combine(
+            last_day, time(last_minute // 60, last_minute % 60), tzinfo=timezone.utc
+        )
+        next_reset_at, streak_expires_at = reset_deadlines(frequency, last_completed)
+        state["last_completed"] = last_completed
+        # Still completed if the period of the last completion has not ended
+        if next_reset_at.date() > calendar.today:
+            state["completed"] = True
+            state["next_reset_at"] = next_reset_at
+        if streak:
+            state["streak_expires_at"] = streak_expires_at
+    return logs, state
+
+def generate_batches(
+    rng: random.Random,
+    first_user_id: int,
+    first_habit_id: int,
+    users: int,
+    habits_per_user: int,
+    days: int,
+    password_hash: str,
+    batch_size: int,
+    raw_sql: bool
+) -> Iterator[Tuple[List[dict], List[dict], List[tuple]]]:
+    """Yield (users, habits, logs) row batches holding roughly `batch_size` logs each"""
+    today = datetime.now(timezone.utc).date()
+    history_days = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    calendar = Calendar(history_days, raw_sql)
+    created_at = datetime.combine(history_days[0], time(0), tzinfo=timezone.utc)
+
+    user_rows, habit_rows, log_rows = [], [], []
+    habit_id = first_habit_id
+    for user_id in range(first_user_id, first_user_id + users):
+        user_rows.append({
+            "id": user_id,
+            "email": f"loadtest{user_id}@example.com",
+            "full_name": f"Load Test User {user_id}",
+            "hashed_password": password_hash,
+        })
+        # Some users are more consistent than others across all their habits
+        propensity = rng.betavariate(5, 2)
+        for _ in range(habits_per_user):
+            template = rng.choice(HABIT_TEMPLATES)
+            rate = min(0.98, max(0.05, (template["completion_rate"] + propensity) / 2 + rng.gauss(0, 0.05)))
+            logs, state = generate_history(rng, habit_id, template, rate, calendar)
+            habit_rows.append({
+                "id": habit_id,
+                "user_id": user_id,
+                "title": template["title"],
+                "description": template["description"],
+                "frequency": template["frequency"],
+                "category": template["category"],
+                "time_of_day": template["time_of_day"],
+                "reminder_time": template["reminder_time"],
+                "is_archived": rng.random() < 0.1,
+                "created_at": created_at,
+                **state,
+            })
+            log_rows.extend(logs)
+            habit_id += 1
+
+        if len(log_rows) >= batch_size:
+            yield user_rows, habit_rows, log_rows
+            user_rows, habit_rows, log_rows = [], [], []
+
+    if user_rows:
+        yield user_rows, habit_rows, log_rows
+
+async def insert_logs(conn: AsyncConnection, rows: List[tuple], raw_sql: bool) -> None:
+    if raw_sql:
+        await conn.exec_driver_sql(
+            f"INSERT INTO habit_logs ({', '.join(LOG_COLUMNS)}) VALUES (?, ?, ?, ?)", rows
+        )
+    else:
+        await conn.execute(insert(HabitLog), [dict(zip(LOG_COLUMNS, row)) for row in rows])
+
+async def insert_daily_stats(conn: AsyncConnection, rows: List[tuple], owners: Dict[int, int], raw_sql: bool) -> None:
+    """One rollup row per log row, as upsert_logs writes them"""
+    stats = [
+        (owners[habit_id], habit_id, day, 1 if completed else 0)
+        for habit_id, day, completed, _ in rows
+    ]
+    if raw_sql:
+        await conn.exec_driver_sql(
+            f"INSERT INTO habit_daily_stats ({', '.join(STAT_COLUMNS)}) VALUES (?, ?, ?, ?)", stats
+        )
+    else:
+        await conn.execute(insert(HabitDailyStat), [dict(zip(STAT_COLUMNS, row)) for row in stats])
+
+async def next_id(conn: AsyncConnection, column) -> int:
+    return (await conn.scalar(select(func.coalesce(func.max(column), 0)))) + 1
+
+async def sync_id_sequences(conn: AsyncConnection) -> None:
+    """
+    Move Postgres id sequences past the explicitly inserted ids.
+
+    SQLite and MySQL advance their autoincrement counters on explicit ids;
+    Postgres sequences do not, so the next register or create_habit would
+    reuse an id.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    for table in (User.__table__, Habit.__table__):
+        await conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table.name}), false)"
+        ))
+
+async def generate_data(
+    users: int,
+    habits_per_user: int,
+    days: int,
+    seed: int,
+    batch_size: int,
+    password: str
+) -> None:
+    """Bulk load synthetic users, habits and habit logs"""
+    engine = build_engine(settings.DATABASE_URL)
+    rng = random.Random(seed)
+    # One bcrypt hash shared by every generated user
+    password_hash = get_password_hash(password)
+
+    start = timer.perf_counter()
+    totals = {"users": 0, "habits": 0, "logs": 0}
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            first_user_id = await next_id(conn, User.id)
+            first_habit_id = await next_id(conn, Habit.id)
+            raw_sql = conn.dialect.name == "sqlite"
+
+            for user_rows, habit_rows, log_rows in generate_batches(
+                rng, first_user_id, first_habit_id, users, habits_per_user,
+                days, password_hash, batch_size, raw_sql
+            ):
+                await conn.execute(insert(User), user_rows)
+                await conn.execute(insert(Habit), habit_rows)
+                owners = {habit["id"]: habit["user_id"] for habit in habit_rows}
+                for offset in range(0, len(log_rows), batch_size):
+                    chunk = log_rows[offset:offset + batch_size]
+                    await insert_logs(conn, chunk, raw_sql)
+                    await insert_daily_stats(conn, chunk, owners, raw_sql)
+                totals["users"] += len(user_rows)
+                totals["habits"] += len(habit_rows)
+                totals["logs"] += len(log_rows)
+            await sync_id_sequences(conn)
+    finally:
+        await engine.dispose()
+
+    elapsed = timer.perf_counter() - start
+    print(
+        f"Generated {totals['users']} users, {totals['habits']} habits and "
+        f"{totals['logs']} habit logs in {elapsed:.1f}s "
+        f"({totals['logs'] / elapsed:,.0f} logs/s)"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic habit data for load testing")
+    parser.add_argument("--users", type=int, default=1000, help="number of users to create")
+    parser.add_argument("--habits", type=int, default=10, help="habits per user")
+    parser.add_argument("--days", type=int, default=100, help="days of log history per habit")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for reproducible data")
+    parser.add_argument("--batch-size", type=int, default=20000, help="rows per bulk insert")
+    parser.add_argument("--password", default="password123", help="password for every generated user")
+    args = parser.parse_args()
+
+    asyncio.run(generate_data(
+        args.users, args.habits, args.days, args.seed, args.batch_size, args.password
+    ))
\ No newline at end of file
@@ -7,8 +7,11 @@ from pathlib import Path
 backend_dir = str(Path(__file__).parent.parent.parent)
 sys.path.append(backend_dir)
 
-from sqlalchemy.ext.asyncio import create_async_engine
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import make_url
 from app.core.config import settings
+from app.db.session import build_engine
 from app.db.base_class import Base
 
 # Import all models to ensure they are registered with SQLAlchemy
@@ -18,16 +21,14 @@ from app.models.habit import Habit
 
 async def init_db():
     # Create database directory if it doesn't exist
-    db_path = settings.DATABASE_URL.replace('sqlite+aiosqlite:///', '')
-    db_dir = os.path.dirname(db_path)
-    if db_dir and not os.path.exists(db_dir):
-        os.makedirs(db_dir)
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite" and url.database:
+        db_dir = os.path.dirname(url.database)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
     
     # Create async engine
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=True
-    )
+    engine = build_engine(settings.DATABASE_URL)
     
     async with engine.begin() as conn:
         # Drop all tables if they exist
@@ -39,8 +40,14 @@ async def init_db():
 
     print("Database tables created successfully!")
 
+def stamp_head():
+    """Record the freshly created schema as current so Alembic upgrades apply on top of it"""
+    alembic_cfg = Config(os.path.join(backend_dir, "alembic.ini"))
+    command.stamp(alembic_cfg, "head")
+
 if __name__ == "__main__":
     try:
         asyncio.run(init_db())
+        stamp_head()
     except Exception as e:
         print(f"Error initializing database: {e}")
\ No newline at end of file
@@ -10,11 +10,13 @@ import random
 backend_dir = str(Path(__file__).parent.parent.parent)
 sys.path.append(backend_dir)
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.session import build_engine
 from app.models.user import User
 from app.models.habit import Habit
+from app.models.habit_daily_stat import HabitDailyStat
 from app.models.habit_log import HabitLog
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -105,6 +107,13 @@ async def create_habit_logs(session: AsyncSession, habit: Habit, completion_rate
             )
         )
         session.add(log)
+        # Keep the statistics rollup in step, as upsert_logs does for live writes
+        session.add(HabitDailyStat(
+            user_id=habit.user_id,
+            habit_id=habit.id,
+            date=current_date.date(),
+            completions=1 if completed else 0
+        ))
         
         # Update streak if completed
         if completed and current_date.date() == datetime.utcnow().date() - timedelta(days=1):
@@ -116,7 +125,7 @@ async def create_habit_logs(session: AsyncSession, habit: Habit, completion_rate
 async def populate_db():
     """Populate database with sample users, habits, and habit logs"""
     # Create async engine
-    engine = create_async_engine(settings.DATABASE_URL, echo=True)
+    engine = build_engine(settings.DATABASE_URL)
     
     # Create async session factory
     async_session = sessionmaker(
@@ -0,0 +1,32 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(backend_dir)
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.session import build_engine
+from app.services.streaks import recompute_all_streaks
+
+async def recompute_streaks():
+    """Rebuild current and longest streaks of every habit from habit_logs"""
+    engine = build_engine(settings.DATABASE_URL)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    start = time.perf_counter()
+    try:
+        async with async_session() as session:
+            rebuilt = await recompute_all_streaks(session)
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+    print(f"Recomputed streaks for {rebuilt} habits in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    asyncio.run(recompute_streaks())
\ No newline at end of file
@@ -1,24 +1,121 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from contextlib import AsyncExitStack
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,
-)
+def _sqlite_pragmas(read_only: bool):
+    """
+    Build a connect-event listener that tunes every new SQLite connection.
+
+    WAL lets readers run alongside the single writer, synchronous=NORMAL is
+    safe under WAL, mmap avoids read syscalls and busy_timeout waits for the
+    writer lock instead of failing with "database is locked". Read-only
+    connections cannot change the journal mode and are pinned to query_only.
+    """
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        else:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+    return set_pragmas
+
+def build_engine(url: str = settings.DATABASE_URL, read_only: bool = False) -> AsyncEngine:
+    """
+    Create an async engine using the profile from settings.
+
+    SQLite connections get WAL and related pragmas; server databases such as
+    Postgres (asyncpg) get a sized connection pool with pre-ping.
+    """
+    options = {"echo": settings.DB_ECHO}
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    if not is_sqlite:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    async_engine = create_async_engine(url, **options)
+    if is_sqlite:
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas(read_only))
+    if settings.METRICS_ENABLED:
+        instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+def read_only_url(url: str) -> Optional[str]:
+    """
+    Read-only variant of a SQLite file URL, or None if the database is not a SQLite file.
+
+    Opens the file through a `mode=ro` URI so reads never take the writer lock.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    if parsed.database.startswith("file:"):
+        return None
+    return str(parsed.set(database=f"file:{parsed.database}", query={"mode": "ro", "uri": "true"}))
+
+def _build_read_engine() -> AsyncEngine:
+    if settings.READ_REPLICA_URL:
+        return build_engine(settings.READ_REPLICA_URL, read_only=True)
+    if settings.SQLITE_READ_ONLY_CONNECTIONS:
+        ro_url = read_only_url(settings.DATABASE_URL)
+        if ro_url:
+            return build_engine(ro_url, read_only=True)
+    return engine
 
-# Create async session factory
+# Create async engines; the read engine is the write engine unless a replica
+# or read-only SQLite connection is available
+engine = build_engine()
+read_engine = _build_read_engine()
+
+# Create async session factories
 async_session = sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+read_session = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
 
-# Dependency to get DB session
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def warm_engine(async_engine: AsyncEngine, connections: int) -> None:
+    """
+    Open `connections` pooled connections and return them to the pool.
+
+    Connection set-up (pragmas, TLS and auth on server databases) then
+    happens before the first requests rather than during them.
+    """
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            connection = await stack.enter_async_context(async_engine.connect())
+            await connection.execute(text("SELECT 1"))
+
+async def dispose_engines() -> None:
+    """Close every pooled connection, e.g. on shutdown"""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+# Dependency to get a DB session for routes that write
+async def get_write_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         try:
             yield session
@@ -27,4 +124,9 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+# Dependency to get a DB session for read-only routes; never commits
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async with read_session() as session:
+        yield session
\ No newline at end of file
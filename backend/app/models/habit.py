@@ -1,5 +1,5 @@
-from datetime import datetime
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -12,22 +12,47 @@ class Habit(Base):
     Represents a habit that a user wants to track. Each habit has properties that define
     its frequency, category, and completion status. Includes last_completed timestamp
     for managing habit resets and streaks.
+
+    next_reset_at and streak_expires_at are materialized when a habit is completed,
+    so the reset engine only has to range-scan habits that are actually due.
     """
     __tablename__ = "habits"
+    __table_args__ = (
+        # Keyset pagination of a user's habit list (newest first)
+        Index("ix_habits_user_listing", "user_id", "is_archived", "created_at", "id"),
+        # List filters used by the habits routes
+        Index("ix_habits_user_category", "user_id", "category", "is_archived"),
+        Index("ix_habits_user_frequency", "user_id", "frequency", "is_archived"),
+        Index("ix_habits_user_completed", "user_id", "completed", "is_archived"),
+        Index("ix_habits_reset_due", "is_archived", "next_reset_at"),
+        Index("ix_habits_streak_due", "is_archived", "streak_expires_at"),
+    )
+    # Fetch server-generated values (updated_at) with RETURNING during the
+    # flush instead of a refresh after commit
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(100), nullable=False)
     description = Column(String(500), nullable=False)
     frequency = Column(String, nullable=False)  # daily, weekly, monthly
     time_of_day = Column(String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Stamped in Python so every row has microsecond precision in a uniform
+    # format, which keyset pagination compares against
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now()
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     streak = Column(Integer, default=0)
+    longest_streak = Column(Integer, default=0, nullable=False, server_default="0")
     completed = Column(Boolean, default=False)
     category = Column(String, nullable=False)
     reminder_time = Column(String)
     is_archived = Column(Boolean, default=False)
     last_completed = Column(DateTime(timezone=True), nullable=True)
+    next_reset_at = Column(DateTime(timezone=True), nullable=True)  # set while completed
+    streak_expires_at = Column(DateTime(timezone=True), nullable=True)  # set while streak > 0
     
     # Foreign key to user
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer
+
+from app.db.base_class import Base
+
+class HabitDailyStat(Base):
+    """
+    Daily rollup of habit_logs for statistics.
+
+    One row per habit per logged day, written in the same transaction as the
+    log itself. Carrying user_id lets per-user statistics range-scan
+    (user_id, date) without joining habits or touching the logs. Scheduled
+    periods are not stored; they follow from each habit's frequency (see
+    app/services/habit_schedule.py).
+
+    Attributes:
+        user_id (int): Owner of the habit, denormalized from habits
+        habit_id (int): The habit the row counts
+        date (date): Day of the log, in the user's local calendar
+        completions (int): 1 if the habit was completed that day, else 0
+    """
+    __tablename__ = "habit_daily_stats"
+    __table_args__ = (
+        # Covers per-user date range aggregation
+        Index("ix_habit_daily_stats_user_date", "user_id", "date", "habit_id", "completions"),
+    )
+
+    habit_id = Column(Integer, ForeignKey("habits.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    completions = Column(Integer, nullable=False, default=0, server_default="0")
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import date, time
-from sqlalchemy import Column, Integer, ForeignKey, Date, Time, Boolean, String, Text
+from sqlalchemy import Column, Integer, ForeignKey, Date, Time, Boolean, String, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -18,6 +18,10 @@ class HabitLog(Base):
         habit (Habit): Relationship to the parent Habit
     """
     __tablename__ = "habit_logs"
+    __table_args__ = (
+        # One log per habit per day; also serves per-habit date range scans
+        Index("uq_habit_logs_habit_date", "habit_id", "date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     habit_id = Column(Integer, ForeignKey("habits.id", ondelete="CASCADE"), nullable=False)
@@ -11,6 +11,9 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     full_name = Column(String)
+    timezone = Column(String, nullable=False, default="UTC", server_default="UTC")  # IANA zone name
+    # Bumped on every write to the user's habits; habit ETags are derived from it
+    habits_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
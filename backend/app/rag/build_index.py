@@ -0,0 +1,34 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(backend_dir)
+
+from app.core.config import settings
+from app.rag.chunking import iter_corpus
+from app.rag.embeddings import EMBEDDERS, get_embedder
+from app.rag.index import build_index
+
+def build(corpus_dir: Path, index_dir: Path, embedder_name: str, dim: int, lists):
+    """Chunk and embed every document in `corpus_dir` into a new index at `index_dir`"""
+    start = time.perf_counter()
+    count = build_index(
+        lambda: iter_corpus(corpus_dir, settings.RAG_CHUNK_WORDS, settings.RAG_CHUNK_OVERLAP_WORDS),
+        index_dir,
+        get_embedder(embedder_name, dim),
+        lists,
+    )
+    print(f"Indexed {count} chunks into {index_dir} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the recommendation vector index")
+    parser.add_argument("--corpus", type=Path, default=Path(settings.RAG_CORPUS_DIR), help="Directory of .md/.txt documents")
+    parser.add_argument("--output", type=Path, default=Path(settings.RAG_INDEX_DIR), help="Index directory to (re)write")
+    parser.add_argument("--embedder", choices=sorted(EMBEDDERS), default=settings.RAG_EMBEDDER)
+    parser.add_argument("--dim", type=int, default=settings.RAG_EMBEDDING_DIM)
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists; default sqrt(chunks) from 20000 chunks, 0 = exact only")
+    args = parser.parse_args()
+    build(args.corpus, args.output, args.embedder, args.dim, args.lists)
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Streaming chunker for source documents.
+
+Markdown and plain-text files are read line by line and split into chunks
+of at most `max_words` words that never cross a section heading. Paragraphs
+are packed together while they fit; longer paragraphs are split with
+`overlap_words` of context carried into the next chunk. Nothing holds more
+than one section in memory, so corpora larger than RAM can be indexed.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+SOURCE_SUFFIXES = (".md", ".txt")
+
+@dataclass
+class Chunk:
+    source: str  # File name relative to the corpus directory
+    section: str  # Nearest heading above the chunk, "" before the first one
+    text: str
+
+    @property
+    def embedding_text(self) -> str:
+        """Text that is embedded: the heading is a strong topic signal for short chunks"""
+        return f"{self.section}. {self.text}" if self.section else self.text
+
+def iter_paragraphs(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """(section, paragraph) pairs; paragraphs are separated by blank lines"""
+    section = ""
+    paragraph: List[str] = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            if paragraph:
+                yield section, " ".join(paragraph)
+                paragraph = []
+            section = stripped.lstrip("#").strip()
+        elif stripped:
+            paragraph.append(stripped)
+        elif paragraph:
+            yield section, " ".join(paragraph)
+            paragraph = []
+    if paragraph:
+        yield section, " ".join(paragraph)
+
+def chunk_lines(
+    source: str,
+    lines: Iterable[str],
+    max_words: int = 120,
+    overlap_words: int = 20
+) -> Iterator[Chunk]:
+    """Chunks of one document given as an iterable of lines"""
+    if not 0 <= overlap_words < max_words:
+        raise ValueError("overlap_words must be at least 0 and less than max_words")
+
+    current_section = None
+    words: List[str] = []
+    for section, paragraph in iter_paragraphs(lines):
+        if section != current_section:
+            if words:
+                yield Chunk(source, current_section, " ".join(words))
+            current_section, words = section, []
+
+        paragraph_words = paragraph.split()
+        if words and len(words) + len(paragraph_words) > max_words:
+            yield Chunk(source, section, " ".join(words))
+            words = []
+        words.extend(paragraph_words)
+        while len(words) > max_words:
+            yield Chunk(source, section, " ".join(words[:max_words]))
+            words = words[max_words - overlap_words:]
+    if words:
+        yield Chunk(source, current_section, " ".join(words))
+
+def iter_corpus(directory: Path, max_words: int = 120, overlap_words: int = 20) -> Iterator[Chunk]:
+    """Chunks of every .md and .txt file under `directory`, in path order"""
+    directory = Path(directory)
+    for path in sorted(directory.rglob("*")):
+        if path.suffix not in SOURCE_SUFFIXES or not path.is_file():
+            continue
+        with open(path, encoding="utf-8") as lines:
+            yield from chunk_lines(path.relative_to(directory).as_posix(), lines, max_words, overlap_words)
\ No newline at end of file
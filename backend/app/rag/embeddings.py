@@ -0,0 +1,164 @@
+"""
+Embedding backends for the retrieval index.
+
+Every backend maps texts to L2-normalized float32 rows, so a dot product is
+the cosine similarity. The built-in backends are local and deterministic,
+need no network or model download, and give the same vectors in every
+process:
+
+- "hashing": signed feature hashing of stemmed words and word bigrams
+- "tfidf": the same features weighted by inverse document frequency, fitted
+  on the corpus when the index is built
+
+Other backends (e.g. a sentence-transformer model) subclass Embedder and are
+added to EMBEDDERS; an index records the backend name, dimension and fitted
+state, and is always queried with the backend it was built with.
+"""
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Sequence, Tuple, Type
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset("""
+    a about after again all an and any are as at be because been before being
+    between both but by can do does doing down during each for from further had
+    has have having he her here hers him his how i if in into is it its itself
+    just me more most my no nor not now of off on once only or other our ours out
+    over own same she should so some such than that the their theirs them then
+    there these they this those through to too under until up very was we were
+    what when where which while who whom why will with you your yours
+""".split())
+BIGRAM_WEIGHT = 0.5
+
+def _stem(token: str) -> str:
+    """Light suffix stripping so that e.g. exercise, exercises and exercising match"""
+    for suffix in ("ing", "ed", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            break
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+def _features(text: str) -> Tuple[List[int], List[float]]:
+    """CRC32 hashes and weights of a text's unigrams and bigrams"""
+    tokens = tokenize(text)
+    hashes = [zlib.crc32(token.encode()) for token in tokens]
+    weights = [1.0] * len(tokens)
+    for first, second in zip(tokens, tokens[1:]):
+        hashes.append(zlib.crc32(f"{first} {second}".encode()))
+        weights.append(BIGRAM_WEIGHT)
+    return hashes, weights
+
+class Embedder(ABC):
+    """Maps texts to L2-normalized float32 vectors of `dim` dimensions"""
+
+    name = ""
+    needs_fit = False  # Whether `fit` must see the corpus before `embed`
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def fit(self, texts: Iterable[str]) -> None:
+        """Learn corpus statistics; called once with every chunk text when building"""
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Fitted arrays saved alongside the index"""
+        return {}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        pass
+
+    def normalize(self, text: str) -> str:
+        """Canonical form of `text`: texts with the same form get the same vector"""
+        return " ".join(text.lower().split())
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) float32 array with unit-length (or all-zero) rows"""
+
+class HashingEmbedder(Embedder):
+    """
+    Signed feature hashing: each unigram and bigram adds +-weight to one of
+    `dim` buckets chosen by its CRC32, so no vocabulary is stored. The sign
+    bit makes colliding features cancel out on average instead of piling up.
+    """
+
+    name = "hashing"
+
+    def normalize(self, text: str) -> str:
+        return " ".join(tokenize(text))
+
+    def _hashed(self, texts: Sequence[str]) -> np.ndarray:
+        rows, hashes, weights = [], [], []
+        for row, text in enumerate(texts):
+            text_hashes, text_weights = _features(text)
+            rows.extend([row] * len(text_hashes))
+            hashes.extend(text_hashes)
+            weights.extend(text_weights)
+
+        hashes = np.asarray(hashes, dtype=np.int64)
+        signs = np.where((hashes >> 16) & 1, -1.0, 1.0)
+        cells = np.asarray(rows, dtype=np.int64) * self.dim + hashes % self.dim
+        return np.bincount(
+            cells, weights=signs * np.asarray(weights), minlength=len(texts) * self.dim
+        ).reshape(len(texts), self.dim)
+
+    def _weighted(self, matrix: np.ndarray) -> np.ndarray:
+        return matrix
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = self._weighted(self._hashed(texts))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0).astype(np.float32)
+
+class TfidfEmbedder(HashingEmbedder):
+    """Hashed features scaled by smoothed inverse document frequency per bucket"""
+
+    name = "tfidf"
+    needs_fit = True
+
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self.idf = np.ones(dim)
+
+    def fit(self, texts: Iterable[str], batch_size: int = 2048) -> None:
+        document_counts = np.zeros(self.dim)
+        documents = 0
+        batch: List[str] = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) == batch_size:
+                document_counts += (self._hashed(batch) != 0).sum(axis=0)
+                documents += len(batch)
+                batch = []
+        if batch:
+            document_counts += (self._hashed(batch) != 0).sum(axis=0)
+            documents += len(batch)
+        self.idf = np.log((1 + documents) / (1 + document_counts)) + 1
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"idf": self.idf}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        self.idf = state["idf"]
+
+    def _weighted(self, matrix: np.ndarray) -> np.ndarray:
+        return matrix * self.idf
+
+EMBEDDERS: Dict[str, Type[Embedder]] = {
+    HashingEmbedder.name: HashingEmbedder,
+    TfidfEmbedder.name: TfidfEmbedder,
+}
+
+def get_embedder(name: str, dim: int) -> Embedder:
+    try:
+        return EMBEDDERS[name](dim)
+    except KeyError:
+        raise ValueError(f"Unknown embedder {name!r}; expected one of {', '.join(EMBEDDERS)}") from None
\ No newline at end of file
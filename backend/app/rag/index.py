@@ -0,0 +1,234 @@
+"""
+Memory-mapped vector index with exact and IVF search.
+
+An index is a directory written once by `build_index` and opened read-only
+by VectorIndex:
+
+    meta.json          embedder name, dimension, chunk and list counts
+    vectors.f32        float32 (count, dim) matrix, rows grouped by IVF list
+    row_chunks.npy     chunk id of each matrix row
+    list_offsets.npy   first row of each IVF list, plus the row count
+    centroids.npy      float32 (lists, dim) IVF list centroids
+    chunks.jsonl       one chunk per line in chunk id order
+    chunk_offsets.npy  byte offset of each line in chunks.jsonl
+    embedder_*.npy     fitted embedder state (e.g. TF-IDF weights)
+
+The matrix and the chunk text are memory-mapped, so opening an index is
+cheap, the OS page cache is shared between worker processes and only the
+pages a search touches are read. Exact search is one matrix-vector product
+over every row; IVF search scores the centroids first and then only the
+rows of the `nprobe` nearest lists, which are contiguous in the file.
+Vectors are L2-normalized, so scores are cosine similarities.
+"""
+import json
+import mmap
+import os
+import shutil
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.rag.chunking import Chunk
+from app.rag.embeddings import Embedder, get_embedder
+
+INDEX_FORMAT = 1
+# Below this many chunks exact search is fast enough and IVF is not built
+IVF_MIN_CHUNKS = 20000
+IVF_TRAINING_SAMPLE_PER_LIST = 64
+IVF_TRAINING_ITERATIONS = 10
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the `k` highest scores per row, best first"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1)
+
+class VectorIndex:
+    """Read-only view of an index directory; safe to share between threads"""
+
+    def __init__(self, directory: Path):
+        directory = Path(directory)
+        meta_path = directory / "meta.json"
+        meta = json.loads(meta_path.read_text())
+        if meta["format"] != INDEX_FORMAT:
+            raise ValueError(f"Unsupported index format {meta['format']} in {directory}")
+
+        self.directory = directory
+        # Changes whenever the index is rebuilt, for keying cached results
+        self.build_id = f"{meta_path.stat().st_mtime_ns:x}"
+        self.dim = meta["dim"]
+        self.count = meta["count"]
+        self.vectors = np.memmap(directory / "vectors.f32", dtype=np.float32, mode="r", shape=(self.count, self.dim))
+        self.row_chunks = np.load(directory / "row_chunks.npy")
+        self.list_offsets = np.load(directory / "list_offsets.npy")
+        self.centroids = np.load(directory / "centroids.npy")
+        self.chunk_offsets = np.load(directory / "chunk_offsets.npy")
+        with open(directory / "chunks.jsonl", "rb") as chunks_file:
+            self._chunks = mmap.mmap(chunks_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.embedder = get_embedder(meta["embedder"], self.dim)
+        self.embedder.load_state({
+            path.stem[len("embedder_"):]: np.load(path) for path in directory.glob("embedder_*.npy")
+        })
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def lists(self) -> int:
+        return len(self.centroids)
+
+    def search_exact(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Scores and chunk ids of the `k` best chunks per query row, comparing every row"""
+        scores = np.asarray(queries @ self.vectors.T)
+        rows = _top_k(scores, k)
+        return np.take_along_axis(scores, rows, axis=1), self.row_chunks[rows]
+
+    def search_ivf(self, queries: np.ndarray, k: int, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate search over the rows of the `nprobe` lists nearest each query"""
+        probes = _top_k(queries @ self.centroids.T, nprobe)
+        all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        all_chunks = np.full((len(queries), k), -1, dtype=np.int64)
+        for i, (query, lists) in enumerate(zip(queries, probes)):
+            bounds = [(self.list_offsets[list_id], self.list_offsets[list_id + 1]) for list_id in lists]
+            scores = np.concatenate([self.vectors[start:end] @ query for start, end in bounds])
+            rows = np.concatenate([np.arange(start, end) for start, end in bounds])
+            best = _top_k(scores[None, :], k)[0]
+            all_scores[i, :len(best)] = scores[best]
+            all_chunks[i, :len(best)] = self.row_chunks[rows[best]]
+        return all_scores, all_chunks
+
+    def search(self, queries: np.ndarray, k: int, nprobe: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        IVF search when the index has lists and `nprobe` is positive, exact
+        search otherwise. IVF rows with fewer than `k` candidates are padded
+        with -inf scores and chunk id -1.
+        """
+        if self.lists and nprobe > 0:
+            return self.search_ivf(queries, k, min(nprobe, self.lists))
+        return self.search_exact(queries, k)
+
+    def chunk(self, chunk_id: int) -> Chunk:
+        start, end = self.chunk_offsets[chunk_id], self.chunk_offsets[chunk_id + 1]
+        return Chunk(**json.loads(self._chunks[start:end]))
+
+    def close(self) -> None:
+        self._chunks.close()
+
+def _train_centroids(vectors: np.ndarray, lists: int, seed: int) -> np.ndarray:
+    """Spherical k-means on a sample of the rows"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), lists * IVF_TRAINING_SAMPLE_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, lists, replace=False)].copy()
+    for _ in range(IVF_TRAINING_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Lists that lost every sample keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids).astype(np.float32)
+    return centroids
+
+def build_index(
+    chunk_source: Callable[[], Iterable[Chunk]],
+    directory: Path,
+    embedder: Embedder,
+    lists: Optional[int] = None,
+    batch_size: int = 1024,
+    seed: int = 0
+) -> int:
+    """
+    Embed every chunk and write an index to `directory`; returns the chunk count.
+
+    `chunk_source` returns a fresh chunk iterator; it is read twice when the
+    embedder has to be fitted first, and chunks are embedded in batches so
+    memory stays bounded. `lists` is the IVF list count, by default about
+    sqrt(count) from IVF_MIN_CHUNKS chunks on and no IVF below that. The
+    index is built in a staging directory and swapped in when complete, so
+    readers never see a partial index.
+    """
+    directory = Path(directory)
+    staging = directory.with_name(f"{directory.name}.build-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    if embedder.needs_fit:
+        embedder.fit(chunk.embedding_text for chunk in chunk_source())
+
+    chunk_offsets = [0]
+    unordered_path = staging / "vectors.unordered"
+    with open(staging / "chunks.jsonl", "wb") as chunks_file, open(unordered_path, "wb") as vectors_file:
+        batch = []
+        for chunk in chunk_source():
+            line = (json.dumps(asdict(chunk), ensure_ascii=False) + "\n").encode()
+            chunks_file.write(line)
+            chunk_offsets.append(chunk_offsets[-1] + len(line))
+            batch.append(chunk.embedding_text)
+            if len(batch) == batch_size:
+                vectors_file.write(embedder.embed(batch).tobytes())
+                batch = []
+        if batch:
+            vectors_file.write(embedder.embed(batch).tobytes())
+
+    count = len(chunk_offsets) - 1
+    if count == 0:
+        shutil.rmtree(staging)
+        raise ValueError("No chunks to index")
+
+    unordered = np.memmap(unordered_path, dtype=np.float32, mode="r", shape=(count, embedder.dim))
+    if lists is None:
+        lists = int(np.sqrt(count)) if count >= IVF_MIN_CHUNKS else 0
+    lists = min(lists, count)
+    if lists:
+        centroids = _train_centroids(unordered, lists, seed)
+        assignment = np.concatenate([
+            np.argmax(unordered[start:start + batch_size * 8] @ centroids.T, axis=1)
+            for start in range(0, count, batch_size * 8)
+        ])
+        order = np.argsort(assignment, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=lists))])
+    else:
+        centroids = np.zeros((0, embedder.dim), dtype=np.float32)
+        order = np.arange(count)
+        list_offsets = np.array([0, count])
+
+    vectors = np.memmap(staging / "vectors.f32", dtype=np.float32, mode="w+", shape=(count, embedder.dim))
+    for start in range(0, count, batch_size * 8):
+        vectors[start:start + batch_size * 8] = unordered[order[start:start + batch_size * 8]]
+    vectors.flush()
+    del vectors, unordered
+    unordered_path.unlink()
+
+    np.save(staging / "row_chunks.npy", order.astype(np.int64))
+    np.save(staging / "list_offsets.npy", list_offsets.astype(np.int64))
+    np.save(staging / "centroids.npy", centroids)
+    np.save(staging / "chunk_offsets.npy", np.asarray(chunk_offsets, dtype=np.int64))
+    for key, value in embedder.state().items():
+        np.save(staging / f"embedder_{key}.npy", value)
+    (staging / "meta.json").write_text(json.dumps({
+        "format": INDEX_FORMAT,
+        "embedder": embedder.name,
+        "dim": embedder.dim,
+        "count": count,
+        "lists": lists,
+    }))
+
+    # Open VectorIndex instances keep reading the old files until they reload
+    previous = directory.with_name(f"{directory.name}.old-{os.getpid()}")
+    try:
+        if directory.exists():
+            os.replace(directory, previous)
+        os.replace(staging, directory)
+    except OSError:
+        # Another process swapped its build in between; leave that one in place
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    finally:
+        shutil.rmtree(previous, ignore_errors=True)
+    return count
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Habit recommendations retrieved from the vector index.
+
+Each of the user's active habits becomes one query (title, description and
+category), all queries are embedded in one batch and searched together, and
+the hits are merged keeping every chunk's best score and the habit that
+matched it.
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from app.core.config import settings
+from app.rag.chunking import iter_corpus
+from app.rag.embeddings import get_embedder
+from app.rag.index import VectorIndex, build_index
+from app.schemas.recommendation import Recommendation
+
+logger = logging.getLogger(__name__)
+
+def habit_query(habit) -> str:
+    """Query text for a row or object with title, description and category"""
+    return ". ".join(part for part in (habit.title, habit.description, habit.category) if part)
+
+def build_corpus_index(corpus_dir: Path, index_dir: Path) -> int:
+    """Chunk, embed and index every document in `corpus_dir` with the configured embedder"""
+    return build_index(
+        lambda: iter_corpus(corpus_dir, settings.RAG_CHUNK_WORDS, settings.RAG_CHUNK_OVERLAP_WORDS),
+        index_dir,
+        get_embedder(settings.RAG_EMBEDDER, settings.RAG_EMBEDDING_DIM),
+    )
+
+class Retriever:
+    """
+    Process-wide handle on the index, opened on first use.
+
+    With RAG_AUTO_BUILD a missing index is built from RAG_CORPUS_DIR first,
+    which takes well under a second for the bundled corpus. Larger corpora
+    should be built ahead of time with app/rag/build_index.py.
+    """
+
+    def __init__(self, index_dir: Path, corpus_dir: Path, auto_build: bool):
+        self.index_dir = Path(index_dir)
+        self.corpus_dir = Path(corpus_dir)
+        self.auto_build = auto_build
+        self._index: Optional[VectorIndex] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> Optional[VectorIndex]:
+        """The index if it is already open"""
+        return self._index
+
+    def build_if_missing(self) -> bool:
+        """
+        Build the index when it is missing and RAG_AUTO_BUILD is on; returns
+        whether an index exists afterwards.
+
+        Production start-up calls this once before the workers fork. If
+        several processes still build at once, losing the final swap is not
+        an error as long as some process's index is in place.
+        """
+        if (self.index_dir / "meta.json").exists():
+            return True
+        if not self.auto_build:
+            return False
+        try:
+            count = build_corpus_index(self.corpus_dir, self.index_dir)
+        except OSError:
+            if not (self.index_dir / "meta.json").exists():
+                raise
+            logger.info("Recommendation index in %s was built by another process", self.index_dir)
+        else:
+            logger.info("Built recommendation index of %d chunks in %s", count, self.index_dir)
+        return True
+
+    def load(self) -> VectorIndex:
+        """The open index; raises FileNotFoundError when it is missing and cannot be built"""
+        if self._index is not None:
+            return self._index
+        with self._lock:
+            if self._index is None:
+                if not self.build_if_missing():
+                    raise FileNotFoundError(f"No recommendation index in {self.index_dir}")
+                self._index = VectorIndex(self.index_dir)
+        return self._index
+
+    def reload(self) -> None:
+        """Open the index again on next use, e.g. after a rebuild"""
+        with self._lock:
+            if self._index is not None:
+                self._index.close()
+            self._index = None
+
+    def recommend(self, habits: Sequence, limit: int, nprobe: int = settings.RAG_IVF_NPROBE) -> List[Recommendation]:
+        """Best `limit` chunks over all habit queries, each chunk at most once"""
+        if not habits or limit <= 0:
+            return []
+        index = self.load()
+        queries = index.embedder.embed([habit_query(habit) for habit in habits])
+        scores, chunk_ids = index.search(queries, limit, nprobe)
+
+        best = {}
+        for habit, habit_scores, habit_chunks in zip(habits, scores.tolist(), chunk_ids.tolist()):
+            for score, chunk_id in zip(habit_scores, habit_chunks):
+                if chunk_id >= 0 and score > 0 and score > best.get(chunk_id, (0.0, None))[0]:
+                    best[chunk_id] = (score, habit)
+
+        ranked = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        recommendations = []
+        for chunk_id, (score, habit) in ranked:
+            chunk = index.chunk(chunk_id)
+            recommendations.append(Recommendation(
+                text=chunk.text,
+                source=chunk.source,
+                section=chunk.section,
+                score=round(score, 4),
+                habit_id=habit.id,
+                habit_title=habit.title,
+            ))
+        return recommendations
+
+retriever = Retriever(settings.RAG_INDEX_DIR, settings.RAG_CORPUS_DIR, settings.RAG_AUTO_BUILD)
\ No newline at end of file
@@ -1,13 +1,20 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 from enum import Enum
 
+from app.core.config import settings
+
 class HabitFrequency(str, Enum):
     DAILY = "daily"
     WEEKLY = "weekly"
     MONTHLY = "monthly"
 
+class HabitHistoryBucket(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
 class HabitCategory(str, Enum):
     MINDFULNESS = "Mindfulness"
     LEARNING = "Learning"
@@ -46,6 +53,7 @@ class HabitInDB(HabitBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     streak: int = 0
+    longest_streak: int = 0
     completed: bool = False
     is_archived: bool = False
     last_completed: Optional[datetime] = None
@@ -64,4 +72,117 @@ class ArchiveResponse(BaseModel):
     id: int
     title: str
     is_archived: bool
-    message: str
\ No newline at end of file
+    message: str
+
+class HabitCountSummary(BaseModel):
+    total: int
+    completed: int
+
+class HabitSummaryResponse(BaseModel):
+    total: int  # Active (unarchived) habits
+    completed: int
+    archived: int
+    by_category: Dict[str, HabitCountSummary]
+    by_frequency: Dict[str, HabitCountSummary]
+    max_streak: int
+    avg_streak: float
+    longest_streak: int
+
+class HabitHistoryPoint(BaseModel):
+    period: date  # First day of the bucket
+    completions: int  # Days with a completion
+    scheduled: int  # Periods due, counted in the bucket holding their first day
+
+class HabitHistoryResponse(BaseModel):
+    habit_id: int
+    bucket: HabitHistoryBucket
+    start: date
+    end: date
+    total_completions: int
+    points: List[HabitHistoryPoint]
+
+class HabitStatsTotals(BaseModel):
+    completions: int  # Periods with at least one completion
+    scheduled: int  # Periods due since the habit was created, one per day, week or month
+    completion_rate: float  # completions / scheduled, 0 when nothing was due
+
+class HabitStatsPoint(HabitStatsTotals):
+    period: date  # First day of the bucket
+
+class HabitStatsByHabit(HabitStatsTotals):
+    habit_id: int
+    title: str
+    category: str
+
+class HabitStatsResponse(BaseModel):
+    bucket: HabitHistoryBucket
+    start: date
+    end: date
+    totals: HabitStatsTotals
+    by_habit: List[HabitStatsByHabit]
+    by_category: Dict[str, HabitStatsTotals]
+    series: List[HabitStatsPoint]
+
+class HabitInsight(BaseModel):
+    habit_id: int
+    title: str
+    scheduled: int  # Periods due in the range, as in HabitStatsTotals
+    completions: int  # Periods completed
+    completion_rate: float
+    consistency_score: int  # 0-100
+    best_hour: Optional[int] = None  # Local hour with the most completions
+
+class HabitInsightsResponse(BaseModel):
+    start: date
+    end: date
+    scheduled: int
+    completions: int
+    completion_rate: float
+    consistency_score: int  # 0-100, habits weighted by scheduled periods
+    best_hour: Optional[int] = None
+    hourly_completions: List[int]  # 24 local hours
+    weekday_completion_rates: List[float]  # Daily habits, Monday first
+    weekday_hour_heatmap: List[List[int]]  # Completions, 7 weekdays x 24 hours
+    habits: List[HabitInsight]
+
+class HabitBatchAction(str, Enum):
+    COMPLETE = "complete"
+    UNCOMPLETE = "uncomplete"
+    UPDATE = "update"
+    ARCHIVE = "archive"
+    UNARCHIVE = "unarchive"
+    DELETE = "delete"
+
+class HabitBatchChanges(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=100)
+    description: Optional[str] = Field(None, min_length=1, max_length=500)
+    frequency: Optional[HabitFrequency] = None
+    category: Optional[HabitCategory] = None
+    time_of_day: Optional[str] = None
+    reminder_time: Optional[str] = None
+
+class HabitBatchOperation(BaseModel):
+    action: HabitBatchAction
+    habit_id: int
+    client_timestamp: datetime = Field(..., description="When the change was made on the client")
+    changes: Optional[HabitBatchChanges] = None  # Required for "update"
+
+class HabitBatchRequest(BaseModel):
+    operations: List[HabitBatchOperation] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.HABIT_BATCH_MAX_OPERATIONS
+    )
+
+class HabitBatchResult(BaseModel):
+    index: int  # Position of the operation in the request
+    habit_id: int
+    action: HabitBatchAction
+    status: int  # Status code the equivalent single request would have returned
+    detail: Optional[str] = None
+    habit: Optional[HabitResponse] = None  # State after the whole batch
+
+class HabitBatchResponse(BaseModel):
+    applied: int
+    failed: int
+    results: List[HabitBatchResult]
\ No newline at end of file
@@ -0,0 +1,13 @@
+from typing import List
+from pydantic import BaseModel
+
+class Recommendation(BaseModel):
+    text: str
+    source: str  # Corpus document the passage comes from
+    section: str
+    score: float  # Cosine similarity to the matching habit, 0-1
+    habit_id: int  # The habit whose query matched this passage best
+    habit_title: str
+
+class RecommendationsResponse(BaseModel):
+    recommendations: List[Recommendation]
\ No newline at end of file
@@ -1,10 +1,18 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import datetime
 from typing import Optional
 
+from app.core.timezones import DEFAULT_TIMEZONE, is_valid_timezone
+
+def validate_timezone(value: Optional[str]) -> Optional[str]:
+    if value is not None and not is_valid_timezone(value):
+        raise ValueError(f"Unknown timezone '{value}', expected an IANA name such as 'Europe/Berlin'")
+    return value
+
 class UserBase(BaseModel):
     email: EmailStr
     full_name: str
+    timezone: str = DEFAULT_TIMEZONE
 
 class UserCreate(UserBase):
     password: str = Field(
@@ -13,6 +21,14 @@ class UserCreate(UserBase):
         description="Password must be at least 8 characters long"
     )
 
+    _check_timezone = field_validator("timezone")(validate_timezone)
+
+class UserUpdate(BaseModel):
+    full_name: Optional[str] = None
+    timezone: Optional[str] = Field(None, description="IANA zone used for resets and streaks")
+
+    _check_timezone = field_validator("timezone")(validate_timezone)
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
@@ -0,0 +1,222 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.timezones import to_local
+from app.models.habit import Habit
+from app.schemas.habit import (
+    HabitBatchAction,
+    HabitBatchOperation,
+    HabitBatchResult,
+    HabitFrequency,
+    HabitResponse
+)
+from app.services.habit_logs import upsert_logs
+from app.services.habit_reset import reset_deadlines
+from app.services.habit_versions import bump_habits_version
+from app.services.streaks import advance_streak, latest_completions, rebuild_streak_states
+
+# Columns written back for every habit the batch touched
+MUTABLE_COLUMNS = (
+    "title", "description", "frequency", "category", "time_of_day", "reminder_time",
+    "completed", "is_archived", "last_completed", "next_reset_at",
+    "streak", "longest_streak", "streak_expires_at", "updated_at",
+)
+
+def _as_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Naive datetimes (as read back from SQLite or sent by clients) are UTC"""
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+class HabitBatch:
+    """
+    Applies a list of offline habit changes for one user in memory.
+
+    Habits and their latest completion dates are loaded with one query each,
+    operations are replayed in client timestamp order against plain dicts,
+    and `flush` writes the outcome with one bulk statement per kind of write
+    (log upsert, habit update, habit delete), whatever the batch size.
+    """
+
+    def __init__(self, user_id: int, zone_name: str, now: Optional[datetime] = None):
+        self.user_id = user_id
+        self.zone_name = zone_name
+        self.now = now or datetime.now(timezone.utc)
+        self.today = to_local(self.now, zone_name).date()
+        self.habits: Dict[int, dict] = {}
+        self.latest = {}
+        self.logs: Dict[Tuple[int, object], dict] = {}
+        self.changed = set()
+        self.deleted = set()
+        self.rebuild = set()
+
+    async def load(self, db: AsyncSession, habit_ids) -> None:
+        result = await db.execute(
+            select(Habit.__table__).where(
+                Habit.id.in_(list(habit_ids)),
+                Habit.user_id == self.user_id
+            )
+        )
+        self.habits = {row.id: dict(row._mapping) for row in result}
+        if self.habits:
+            self.latest = await latest_completions(db, self.habits)
+
+    def apply(self, operation: HabitBatchOperation) -> Tuple[int, Optional[str]]:
+        """Apply one operation and return the (status, detail) a single request would have"""
+        habit = self.habits.get(operation.habit_id)
+        if habit is None or operation.habit_id in self.deleted:
+            return 404, "Habit not found"
+
+        at = _as_utc(operation.client_timestamp)
+        if at > self.now + timedelta(seconds=settings.HABIT_BATCH_MAX_CLOCK_SKEW_SECONDS):
+            return 422, "client_timestamp is in the future"
+
+        action = operation.action
+        if action == HabitBatchAction.COMPLETE:
+            self._complete(habit, at)
+        elif action == HabitBatchAction.UNCOMPLETE:
+            self._uncomplete(habit)
+        elif action == HabitBatchAction.UPDATE:
+            changes = operation.changes.model_dump(exclude_unset=True, mode="json") if operation.changes else {}
+            if not changes:
+                return 422, "'changes' is required for update"
+            frequency_changed = "frequency" in changes and changes["frequency"] != habit["frequency"]
+            habit.update(changes)
+            if frequency_changed:
+                # Streaks count periods, so they are recounted in the new frequency
+                self.rebuild.add(habit["id"])
+                if habit["completed"] and habit["last_completed"]:
+                    habit["next_reset_at"], habit["streak_expires_at"] = reset_deadlines(
+                        HabitFrequency(habit["frequency"]), habit["last_completed"], self.zone_name
+                    )
+        elif action in (HabitBatchAction.ARCHIVE, HabitBatchAction.UNARCHIVE):
+            habit["is_archived"] = action == HabitBatchAction.ARCHIVE
+        elif action == HabitBatchAction.DELETE:
+            self.deleted.add(habit["id"])
+            return 204, None
+
+        self.changed.add(habit["id"])
+        return 200, None
+
+    def _complete(self, habit: dict, at: datetime) -> None:
+        habit_id = habit["id"]
+        frequency = HabitFrequency(habit["frequency"])
+        local_at = to_local(at, self.zone_name)
+        day = local_at.date()
+        self.logs[(habit_id, day)] = {
+            "habit_id": habit_id,
+            "date": day,
+            "completed": True,
+            "completion_time": local_at.time().replace(tzinfo=None),
+        }
+
+        previous = self.latest.get(habit_id)
+        if previous is None or day >= previous:
+            habit["streak"], habit["longest_streak"] = advance_streak(
+                frequency, habit["streak"] or 0, habit["longest_streak"] or 0, previous, day
+            )
+            self.latest[habit_id] = day
+        else:
+            # A backdated completion can join two runs; recount from the log
+            self.rebuild.add(habit_id)
+
+        last_completed = _as_utc(habit["last_completed"])
+        if last_completed is None or at >= last_completed:
+            next_reset_at, streak_expires_at = reset_deadlines(frequency, at, self.zone_name)
+            habit["last_completed"] = at
+            habit["completed"] = next_reset_at > self.now
+            habit["next_reset_at"] = next_reset_at if habit["completed"] else None
+            habit["streak_expires_at"] = streak_expires_at
+
+    def _uncomplete(self, habit: dict) -> None:
+        if habit["completed"] and habit["last_completed"]:
+            day = to_local(habit["last_completed"], self.zone_name).date()
+            self.logs[(habit["id"], day)] = {
+                "habit_id": habit["id"],
+                "date": day,
+                "completed": False,
+                "completion_time": None,
+            }
+        habit["completed"] = False
+        habit["next_reset_at"] = None
+        self.rebuild.add(habit["id"])
+
+    async def flush(self, db: AsyncSession) -> None:
+        await upsert_logs(db, self.user_id, [
+            row for (habit_id, _), row in self.logs.items() if habit_id not in self.deleted
+        ])
+
+        rebuild = {habit_id: self.habits[habit_id] for habit_id in self.rebuild - self.deleted}
+        await rebuild_streak_states(db, rebuild, self.today, self.zone_name)
+
+        updates = []
+        for habit_id in self.changed - self.deleted:
+            habit = self.habits[habit_id]
+            expires_at = _as_utc(habit["streak_expires_at"])
+            if expires_at is not None and expires_at <= self.now:
+                # Replayed too late to keep the streak, as the reset engine would decide
+                habit["streak"], habit["streak_expires_at"] = 0, None
+            habit["updated_at"] = self.now
+            updates.append({"id": habit_id, **{column: habit[column] for column in MUTABLE_COLUMNS}})
+        if updates:
+            await db.execute(update(Habit), updates)
+            # Read the rows back so results carry timestamps exactly as stored,
+            # the same as the single-habit endpoints return them
+            stored = await db.execute(select(Habit.__table__).where(Habit.id.in_([row["id"] for row in updates])))
+            for row in stored:
+                self.habits[row.id] = dict(row._mapping)
+
+        if self.deleted:
+            # habit_logs rows go with them through ON DELETE CASCADE
+            await db.execute(
+                delete(Habit)
+                .where(Habit.id.in_(self.deleted), Habit.user_id == self.user_id)
+                .execution_options(synchronize_session=False)
+            )
+
+        if self.changed or self.deleted:
+            await bump_habits_version(db, self.user_id)
+
+async def apply_habit_batch(
+    db: AsyncSession,
+    user_id: int,
+    zone_name: str,
+    operations: List[HabitBatchOperation]
+) -> List[HabitBatchResult]:
+    """
+    Apply offline changes of one user and report a result per operation.
+
+    Operations are replayed in client timestamp order (ties keep request order)
+    and results are returned in request order. Failed operations, such as an
+    unknown habit, do not affect the others; the caller commits everything in
+    one transaction.
+    """
+    batch = HabitBatch(user_id, zone_name)
+    await batch.load(db, {operation.habit_id for operation in operations})
+
+    outcomes = [None] * len(operations)
+    order = sorted(range(len(operations)), key=lambda i: _as_utc(operations[i].client_timestamp))
+    for index in order:
+        outcomes[index] = batch.apply(operations[index])
+
+    await batch.flush(db)
+
+    results = []
+    for index, (operation, (status, detail)) in enumerate(zip(operations, outcomes)):
+        habit = batch.habits.get(operation.habit_id)
+        results.append(HabitBatchResult(
+            index=index,
+            habit_id=operation.habit_id,
+            action=operation.action,
+            status=status,
+            detail=detail,
+            habit=(
+                HabitResponse.model_validate(habit)
+                if status == 200 and operation.habit_id not in batch.deleted else None
+            )
+        ))
+    return results
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Per-user pub/sub of habit changes, streamed to clients over SSE.
+
+Routes and the reset engine publish after they commit; GET /api/habits/stream
+subscribes. Events are encoded once per publish and fanned out to in-memory
+queues, so an idle stream costs one queue and no database work.
+
+The in-process broker only reaches clients connected to the same worker. Set
+HABIT_EVENTS_BROKER_URL to a Redis URL (requires `pip install redis`) to relay
+events between workers.
+"""
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sent instead of dropped events when a subscriber falls behind
+RESYNC_FRAME = "event: resync\ndata: {}\n\n"
+
+def encode_event(event_type: str, data: dict) -> str:
+    """SSE frame for one event; `data` must be JSON serializable"""
+    return f"event: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+class Subscription:
+    """
+    Bounded queue of encoded frames for one connected client.
+
+    A client that stops reading cannot grow memory without bound: when the
+    queue is full its backlog is dropped and replaced by a single resync
+    event, telling the client to refetch.
+    """
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def deliver(self, frame: str) -> None:
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC_FRAME)
+
+    async def next_frame(self, timeout: float) -> Optional[str]:
+        """Next frame, or None if nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class HabitEventBroker(ABC):
+    """Interface between habit writers and streaming clients"""
+
+    @abstractmethod
+    async def publish(self, user_id: int, event_type: str, data: dict) -> None:
+        """Send an event to every subscription of `user_id`"""
+
+    @abstractmethod
+    def subscribe(self, user_id: int):
+        """Async context manager yielding a Subscription for `user_id`"""
+
+    @abstractmethod
+    def subscriber_count(self) -> int:
+        """Open subscriptions in this process, reported by /metrics"""
+
+    async def start(self) -> None:
+        """Called from the application lifespan before requests are served"""
+
+    async def stop(self) -> None:
+        """Called from the application lifespan on shutdown"""
+
+class InMemoryHabitEventBroker(HabitEventBroker):
+    """asyncio pub/sub keyed by user id, local to one worker process"""
+
+    def __init__(self, queue_size: int = settings.HABIT_EVENTS_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._subscriptions: Dict[int, Set[Subscription]] = defaultdict(set)
+
+    def deliver(self, user_id: int, frame: str) -> None:
+        for subscription in self._subscriptions.get(user_id, ()):
+            subscription.deliver(frame)
+
+    async def publish(self, user_id: int, event_type: str, data: dict) -> None:
+        self.deliver(user_id, encode_event(event_type, data))
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[Subscription]:
+        subscription = Subscription(self._queue_size)
+        self._subscriptions[user_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions.get(user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[user_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+class RedisHabitEventBroker(InMemoryHabitEventBroker):
+    """
+    Relays events between workers through Redis pub/sub.
+
+    Publishes go to a per-user channel; each worker holds one pattern
+    subscription and hands incoming frames to its local subscriptions, so
+    Redis connections do not grow with the number of clients.
+    """
+
+    CHANNEL_PREFIX = "habits:events:"
+
+    def __init__(self, url: str, queue_size: int = settings.HABIT_EVENTS_QUEUE_SIZE):
+        super().__init__(queue_size)
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "HABIT_EVENTS_BROKER_URL requires the redis package: pip install redis"
+            ) from exc
+        self._redis = redis.from_url(url)
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, user_id: int, event_type: str, data: dict) -> None:
+        await self._redis.publish(f"{self.CHANNEL_PREFIX}{user_id}", encode_event(event_type, data))
+
+    async def start(self) -> None:
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+        self._task = asyncio.create_task(self._relay())
+
+    async def _relay(self) -> None:
+        async for message in self._pubsub.listen():
+            if message["type"] != "pmessage":
+                continue
+            try:
+                channel = message["channel"]
+                channel = channel.decode() if isinstance(channel, bytes) else channel
+                user_id = int(channel[len(self.CHANNEL_PREFIX):])
+                frame = message["data"]
+                self.deliver(user_id, frame.decode() if isinstance(frame, bytes) else frame)
+            except Exception:
+                logger.exception("Dropped malformed habit event from Redis")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.close()
+        await self._redis.close()
+
+def build_broker() -> HabitEventBroker:
+    if settings.HABIT_EVENTS_BROKER_URL:
+        return RedisHabitEventBroker(settings.HABIT_EVENTS_BROKER_URL)
+    return InMemoryHabitEventBroker()
+
+habit_events = build_broker()
+
+async def publish_habit_event(user_id: int, event_type: str, data: dict) -> None:
+    """
+    Publish a committed change to the user's streams.
+
+    Delivery is best effort: the write has already committed, so a broker
+    failure is logged rather than turned into an error response.
+    """
+    try:
+        await habit_events.publish(user_id, event_type, data)
+    except Exception:
+        logger.exception("Failed to publish %s for user %s", event_type, user_id)
\ No newline at end of file
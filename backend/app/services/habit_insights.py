@@ -0,0 +1,208 @@
+"""
+Per-user completion insights computed with NumPy.
+
+A user's logs in the requested window are read with one query as four
+integer columns (habit, day number, completed, minute of day) and every
+metric is computed with array operations: per-habit figures come from
+np.bincount over a habit index rather than from a Python loop per log row.
+Rates are taken over scheduled periods derived from each habit's frequency
+(app/services/habit_schedule.py), so periods without a log count as missed.
+"""
+from datetime import date
+from itertools import chain
+from typing import List, Sequence, Tuple
+import numpy as np
+from sqlalchemy import Integer, cast, extract, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.schemas.habit import HabitFrequency, HabitInsight, HabitInsightsResponse
+from app.services.habit_schedule import EPOCH, EPOCH_WEEKDAY, habit_periods, load_due_windows
+# Recent days weigh more in the consistency score; a day this old counts half
+RECENCY_HALF_LIFE_DAYS = 30
+# Completion times spread this much (standard deviation) or more score 0 for timing
+TIMING_SPREAD_MINUTES = 180
+NO_TIME = -1
+
+def _day_number(dialect_name: str, column):
+    """Days since 1970-01-01 as an integer SQL expression"""
+    if dialect_name == "postgresql":
+        return column - literal(EPOCH)
+    return cast(func.julianday(column) - 2440587.5, Integer)
+
+def _minute_of_day(dialect_name: str, column):
+    """Minutes since midnight of a time column, or NO_TIME when it is null"""
+    if dialect_name == "postgresql":
+        minutes = cast(extract("hour", column) * 60 + extract("minute", column), Integer)
+    else:
+        minutes = cast(func.strftime("%H", column), Integer) * 60 + cast(func.strftime("%M", column), Integer)
+    return func.coalesce(minutes, NO_TIME)
+
+async def load_log_columns(db: AsyncSession, user_id: int, start: date, end: date) -> np.ndarray:
+    """
+    The user's logs between `start` and `end` as an (n, 4) int64 array.
+
+    Columns are habit id, day number, completed (0/1) and minute of day.
+    Dates and times are converted to integers in SQL, so rows go into the
+    array through np.fromiter without per-row Python conversions.
+    """
+    dialect_name = db.get_bind().dialect.name
+    result = await db.execute(
+        select(
+            HabitLog.habit_id,
+            _day_number(dialect_name, HabitLog.date),
+            cast(HabitLog.completed, Integer),
+            _minute_of_day(dialect_name, HabitLog.completion_time),
+        )
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .where(Habit.user_id == user_id, HabitLog.date.between(start, end))
+    )
+    rows = result.all()
+    return np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=len(rows) * 4).reshape(-1, 4)
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+def _concatenate(parts: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenated per-habit arrays and the habit index of every element"""
+    if not parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(parts), np.repeat(np.arange(len(parts)), [len(part) for part in parts])
+
+def compute_insights(columns: np.ndarray, windows: Sequence[Tuple[int, str, int, int]], today: date, end: date) -> dict:
+    """
+    Metrics over log columns from `load_log_columns` and the (habit id,
+    frequency, first, last) due windows of the user's habits, in id order.
+
+    - completion rate: completed periods / scheduled periods (see habit_schedule)
+    - best hour: hour of day with the most completions
+    - weekday rates over daily habits, the only ones due on every weekday,
+      and a weekday x hour heatmap of completions
+    - consistency score (0-100): 70% recency-weighted completion rate
+      (weights halve every RECENCY_HALF_LIFE_DAYS) plus 30% timing
+      regularity, 1 minus the standard deviation of completion times over
+      TIMING_SPREAD_MINUTES, floored at 0
+    Per-habit values are aligned with the returned `habit_ids`, the habits
+    with at least one scheduled period.
+    """
+    # Completed log days of each habit, split by habit without a loop over rows
+    completed_rows = columns[columns[:, 2] == 1]
+    completed_rows = completed_rows[np.argsort(completed_rows[:, 0], kind="stable")]
+    log_habits, log_starts = np.unique(completed_rows[:, 0], return_index=True)
+    completed_days = dict(zip(log_habits.tolist(), np.split(completed_rows[:, 1], log_starts[1:])))
+
+    habit_ids, daily, due_parts, done_parts = [], [], [], []
+    for habit_id, frequency, first, last in windows:
+        due, done = habit_periods(frequency, completed_days.get(habit_id, []), first, last, today)
+        if len(due):
+            habit_ids.append(habit_id)
+            daily.append(frequency == HabitFrequency.DAILY)
+            due_parts.append(due)
+            done_parts.append(done)
+    habit_ids = np.array(habit_ids, dtype=np.int64)
+    habit_count = len(habit_ids)
+    due_days, due_index = _concatenate(due_parts)
+    done_days, done_index = _concatenate(done_parts)
+
+    scheduled = np.bincount(due_index, minlength=habit_count)
+    completions = np.bincount(done_index, minlength=habit_count)
+
+    def recency(days: np.ndarray) -> np.ndarray:
+        return 0.5 ** (((end - EPOCH).days - days) / RECENCY_HALF_LIFE_DAYS)
+
+    weighted_rate = _ratio(
+        np.bincount(done_index, weights=recency(done_days), minlength=habit_count),
+        np.bincount(due_index, weights=recency(due_days), minlength=habit_count)
+    )
+
+    # Timed completions of the reported habits, located by binary search
+    position = np.minimum(np.searchsorted(habit_ids, columns[:, 0]), max(habit_count - 1, 0))
+    reported = habit_ids[position] == columns[:, 0] if habit_count else np.zeros(len(columns), dtype=bool)
+    days, minutes = columns[:, 1], columns[:, 3]
+    timed = reported & (columns[:, 2] == 1) & (minutes != NO_TIME)
+    timed_index, timed_minutes = position[timed], minutes[timed].astype(np.float64)
+    timed_count = np.bincount(timed_index, minlength=habit_count)
+    mean = _ratio(np.bincount(timed_index, weights=timed_minutes, minlength=habit_count), timed_count)
+    mean_square = _ratio(np.bincount(timed_index, weights=timed_minutes ** 2, minlength=habit_count), timed_count)
+    spread = np.sqrt(np.maximum(mean_square - mean ** 2, 0))
+    regularity = np.where(timed_count > 0, np.clip(1 - spread / TIMING_SPREAD_MINUTES, 0, 1), 0)
+    consistency = np.rint(100 * (0.7 * weighted_rate + 0.3 * regularity))
+
+    hours = timed_minutes.astype(np.int64) // 60
+    habit_hourly = np.bincount(timed_index * 24 + hours, minlength=habit_count * 24).reshape(habit_count, 24)
+    hourly = habit_hourly.sum(axis=0)
+
+    daily = np.array(daily, dtype=bool)
+    due_weekdays = (due_days[daily[due_index]] + EPOCH_WEEKDAY) % 7
+    done_weekdays = (done_days[daily[done_index]] + EPOCH_WEEKDAY) % 7
+    weekday_rates = _ratio(np.bincount(done_weekdays, minlength=7), np.bincount(due_weekdays, minlength=7))
+    heatmap = np.bincount(((days[timed] + EPOCH_WEEKDAY) % 7) * 24 + hours, minlength=7 * 24).reshape(7, 24)
+
+    total_scheduled = int(scheduled.sum())
+    total_completions = int(completions.sum())
+    return {
+        "habit_ids": habit_ids,
+        "scheduled": scheduled,
+        "completions": completions,
+        "completion_rates": _ratio(completions, scheduled),
+        "consistency_scores": consistency.astype(np.int64),
+        # -1 for habits without timed completions
+        "best_hours": np.where(habit_hourly.any(axis=1), habit_hourly.argmax(axis=1), -1),
+        "total_scheduled": total_scheduled,
+        "total_completions": total_completions,
+        "completion_rate": total_completions / total_scheduled if total_scheduled else 0.0,
+        # Each habit counts in proportion to its scheduled periods
+        "consistency_score": int(np.rint(np.average(consistency, weights=scheduled))) if total_scheduled else 0,
+        "best_hour": int(hourly.argmax()) if hourly.any() else None,
+        "hourly": hourly,
+        "weekday_rates": weekday_rates,
+        "heatmap": heatmap,
+    }
+
+async def get_habit_insights(
+    db: AsyncSession,
+    user_id: int,
+    zone_name: str,
+    today: date,
+    start: date,
+    end: date
+) -> HabitInsightsResponse:
+    windows = await load_due_windows(db, user_id, zone_name, today, start, end)
+    columns = await load_log_columns(db, user_id, start, end)
+    metrics = compute_insights(
+        columns, [(habit.id, habit.frequency, first, last) for habit, first, last in windows], today, end
+    )
+    titles = {habit.id: habit.title for habit, _, _ in windows}
+
+    return HabitInsightsResponse(
+        start=start,
+        end=end,
+        scheduled=metrics["total_scheduled"],
+        completions=metrics["total_completions"],
+        completion_rate=round(metrics["completion_rate"], 4),
+        consistency_score=metrics["consistency_score"],
+        best_hour=metrics["best_hour"],
+        hourly_completions=metrics["hourly"].tolist(),
+        weekday_completion_rates=np.round(metrics["weekday_rates"], 4).tolist(),
+        weekday_hour_heatmap=metrics["heatmap"].tolist(),
+        habits=[
+            HabitInsight(
+                habit_id=habit_id,
+                title=titles.get(habit_id, ""),
+                scheduled=scheduled,
+                completions=completions,
+                completion_rate=round(rate, 4),
+                consistency_score=score,
+                best_hour=best_hour if best_hour >= 0 else None,
+            )
+            for habit_id, scheduled, completions, rate, score, best_hour in zip(
+                metrics["habit_ids"].tolist(),
+                metrics["scheduled"].tolist(),
+                metrics["completions"].tolist(),
+                metrics["completion_rates"].tolist(),
+                metrics["consistency_scores"].tolist(),
+                metrics["best_hours"].tolist(),
+            )
+        ],
+    )
\ No newline at end of file
@@ -0,0 +1,154 @@
+from datetime import date, datetime
+from typing import List
+
+import numpy as np
+from sqlalchemy import Date, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.habit_daily_stat import HabitDailyStat
+from app.models.habit_log import HabitLog
+from app.schemas.habit import HabitHistoryBucket, HabitHistoryPoint
+from app.services.habit_schedule import day_number, from_day_number, habit_periods, period_starts
+
+def _dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+def _dialect_insert(db: AsyncSession):
+    return postgresql.insert if _dialect_name(db) == "postgresql" else sqlite.insert
+
+async def upsert_daily_stats(db: AsyncSession, rows: List[dict]) -> None:
+    """
+    Write habit_daily_stats rows in one bulk statement.
+
+    Each row holds user_id, habit_id, date and completions; existing
+    (habit_id, date) rows are overwritten.
+    """
+    if not rows:
+        return
+    statement = _dialect_insert(db)(HabitDailyStat)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[HabitDailyStat.habit_id, HabitDailyStat.date],
+            set_={"completions": statement.excluded.completions},
+        ),
+        rows
+    )
+
+async def upsert_logs(db: AsyncSession, user_id: int, rows: List[dict]) -> None:
+    """
+    Write the completion state of (habit_id, date) logs of one user's habits.
+
+    Each row holds habit_id, date, completed and completion_time. Upserts on
+    the unique (habit_id, date) index, so existing logs are updated in place,
+    and the matching habit_daily_stats rows are upserted alongside, so the
+    rollup commits or rolls back with the logs.
+    """
+    if not rows:
+        return
+    statement = _dialect_insert(db)(HabitLog)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[HabitLog.habit_id, HabitLog.date],
+            set_={
+                "completed": statement.excluded.completed,
+                "completion_time": statement.excluded.completion_time,
+            },
+        ),
+        rows
+    )
+    await upsert_daily_stats(db, [
+        {
+            "user_id": user_id,
+            "habit_id": row["habit_id"],
+            "date": row["date"],
+            "completions": 1 if row["completed"] else 0,
+        }
+        for row in rows
+    ])
+
+async def record_completion(db: AsyncSession, user_id: int, habit_id: int, completed_at: datetime) -> None:
+    """
+    Mark the habit's log for the completion date as completed.
+
+    `completed_at` should be in the user's local time, so the log date and
+    completion time follow the user's calendar. Completing twice on the same
+    day keeps a single log row.
+    """
+    await upsert_logs(db, user_id, [{
+        "habit_id": habit_id,
+        "date": completed_at.date(),
+        "completed": True,
+        "completion_time": completed_at.time().replace(tzinfo=None),
+    }])
+
+async def record_uncompletion(db: AsyncSession, habit_id: int, completed_on: date) -> None:
+    """Mark the log of an undone completion, and its daily stats row, as missed"""
+    await db.execute(
+        update(HabitLog)
+        .where(HabitLog.habit_id == habit_id, HabitLog.date == completed_on)
+        .values(completed=False, completion_time=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(HabitDailyStat)
+        .where(HabitDailyStat.habit_id == habit_id, HabitDailyStat.date == completed_on)
+        .values(completions=0)
+        .execution_options(synchronize_session=False)
+    )
+
+def period_expression(dialect_name: str, bucket: HabitHistoryBucket, column=HabitLog.date):
+    """SQL expression mapping a date column to the first day of its bucket"""
+    if bucket == HabitHistoryBucket.DAY:
+        return column
+    if dialect_name == "postgresql":
+        return func.date_trunc(bucket.value, column).cast(Date)
+    if bucket == HabitHistoryBucket.WEEK:
+        # Back up to the ISO week's Monday
+        return func.date(column, "-6 days", "weekday 1", type_=Date)
+    return func.date(column, "start of month", type_=Date)
+
+async def completion_history(
+    db: AsyncSession,
+    habit,
+    first: int,
+    last: int,
+    today: date,
+    start: date,
+    end: date,
+    bucket: HabitHistoryBucket
+) -> List[HabitHistoryPoint]:
+    """
+    Completion series for one habit with id and frequency, due on day
+    numbers `first`..`last` (see habit_schedule.load_due_windows).
+
+    Completions are aggregated by a single GROUP BY over the (habit_id, date)
+    index range, so the cost depends on the requested window rather than the
+    habit's full history. Scheduled periods are derived from the frequency;
+    the latest completion in the window tells whether the period in progress
+    counts yet.
+    """
+    period = period_expression(_dialect_name(db), bucket).label("period")
+    result = await db.execute(
+        select(period, func.count().label("completions"))
+        .where(HabitLog.habit_id == habit.id, HabitLog.date.between(start, end), HabitLog.completed == True)
+        .group_by(period)
+    )
+    completions = {row.period: row.completions for row in result}
+
+    latest = await db.scalar(
+        select(func.max(HabitLog.date))
+        .where(HabitLog.habit_id == habit.id, HabitLog.date.between(start, end), HabitLog.completed == True)
+    )
+    due, _ = habit_periods(habit.frequency, [day_number(latest)] if latest else [], first, last, today)
+    buckets, counts = np.unique(period_starts(bucket.value, due), return_counts=True)
+    scheduled = {from_day_number(day): count for day, count in zip(buckets.tolist(), counts.tolist())}
+
+    return [
+        HabitHistoryPoint(
+            period=point,
+            completions=completions.get(point, 0),
+            scheduled=scheduled.get(point, 0)
+        )
+        for point in sorted(completions.keys() | scheduled.keys())
+    ]
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Cached habit recommendations.
+
+Results are keyed by a fingerprint of what retrieval actually sees: the
+embedder's normalized form of each queried habit, as a sorted set, plus the
+index build and the result limit. Users with the same habits (e.g. the
+onboarding templates) share one entry, edits that do not change the queries
+(a reminder time, a completion) keep hitting it, and a rebuilt index or a
+habit set changed on another worker can never be served stale results.
+
+Entries refer to habits by their position in the sorted set, so a shared
+entry is mapped back to the requesting user's own habit ids and titles.
+Each user points at the fingerprint they were last served. Creating,
+editing, archiving or deleting a habit drops the user's pointer, and the
+entry is evicted once no user points at it; an entry shared with other users
+with the same habits stays for them. Entries nobody was served in this
+process (e.g. loaded from a snapshot) age out through TTL and LRU.
+
+With RECOMMENDATION_CACHE_PATH set, the cache is saved as a JSON snapshot
+on shutdown and loaded on start-up, so restarts do not re-run retrieval.
+"""
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.habit import Habit
+from app.rag.index import VectorIndex
+from app.rag.retrieval import habit_query, retriever
+from app.schemas.recommendation import Recommendation
+
+logger = logging.getLogger(__name__)
+
+# Habit fields that make up recommendation queries; other edits keep cached results
+RECOMMENDATION_FIELDS = frozenset({"title", "description", "category"})
+
+# Fingerprint -> [[text, source, section, score, habit position], ...]
+recommendation_cache = TTLCache(
+    maxsize=settings.RECOMMENDATION_CACHE_MAXSIZE,
+    ttl=settings.RECOMMENDATION_CACHE_TTL_SECONDS
+)
+# User id -> fingerprint last served to them; dropped on the user's habit writes
+_served_fingerprints = TTLCache(
+    maxsize=settings.RECOMMENDATION_CACHE_MAXSIZE,
+    ttl=settings.RECOMMENDATION_CACHE_TTL_SECONDS
+)
+# Fingerprint -> users whose pointer may refer to it. Pointers that expire or
+# are evicted from _served_fingerprints are only dropped here when checked.
+_fingerprint_users: Dict[str, Set[int]] = {}
+
+async def load_query_habits(db: AsyncSession, user_id: int) -> list:
+    """The most recently created active habits, up to RAG_MAX_QUERY_HABITS"""
+    return (await db.execute(
+        select(Habit.id, Habit.title, Habit.description, Habit.category)
+        .where(Habit.user_id == user_id, Habit.is_archived == False)
+        .order_by(Habit.created_at.desc(), Habit.id.desc())
+        .limit(settings.RAG_MAX_QUERY_HABITS)
+    )).all()
+
+def habit_set_fingerprint(index: VectorIndex, habits: Sequence, limit: int) -> Tuple[str, list]:
+    """
+    Fingerprint of the habit set and the habits in fingerprint order.
+
+    Habits whose queries normalize to the same text are one member of the
+    set; the first of them represents it.
+    """
+    members = {}
+    for habit in habits:
+        members.setdefault(index.embedder.normalize(habit_query(habit)), habit)
+    keys = sorted(members)
+    digest = hashlib.blake2b(
+        "\n".join([index.build_id, str(limit), *keys]).encode(), digest_size=16
+    ).hexdigest()
+    return digest, [members[key] for key in keys]
+
+async def get_recommendations(user_id: int, habits: Sequence, limit: int) -> Tuple[str, List[Recommendation]]:
+    """
+    Fingerprint and recommendations for `habits`, retrieving only on a cache miss.
+
+    Opening (or building) the index and retrieval are CPU and disk work, so
+    they run in the thread pool; the caches are only touched from the event
+    loop, since TTLCache is not thread-safe.
+    """
+    index = retriever.index
+    if index is None:
+        index = await run_in_threadpool(retriever.load)
+    fingerprint, ordered = habit_set_fingerprint(index, habits, limit)
+    _point(user_id, fingerprint)
+
+    entries = recommendation_cache.get(fingerprint)
+    if entries is None:
+        positions = {habit.id: position for position, habit in enumerate(ordered)}
+        entries = [
+            [item.text, item.source, item.section, item.score, positions[item.habit_id]]
+            for item in await run_in_threadpool(retriever.recommend, ordered, limit)
+        ]
+        recommendation_cache.set(fingerprint, entries)
+
+    return fingerprint, [
+        Recommendation(
+            text=text,
+            source=source,
+            section=section,
+            score=score,
+            habit_id=ordered[position].id,
+            habit_title=ordered[position].title,
+        )
+        for text, source, section, score, position in entries
+    ]
+
+def _point(user_id: int, fingerprint: str) -> None:
+    """Record `fingerprint` as served to `user_id`, releasing the one served before"""
+    previous = _served_fingerprints.peek(user_id)
+    _served_fingerprints.set(user_id, fingerprint)
+    if previous == fingerprint:
+        return
+    if previous is not None:
+        _release(user_id, previous)
+    if fingerprint not in _fingerprint_users and len(_fingerprint_users) >= _served_fingerprints.maxsize:
+        # Sweep pointers that expired unreleased so the index stays bounded
+        for stale in list(_fingerprint_users):
+            _release(None, stale)
+    _fingerprint_users.setdefault(fingerprint, set()).add(user_id)
+
+def _release(user_id: Optional[int], fingerprint: str) -> None:
+    """Drop `user_id`'s pointer to `fingerprint` and evict the entry once no user points at it"""
+    users = _fingerprint_users.get(fingerprint)
+    if users is None:
+        return
+    users.discard(user_id)
+    users.difference_update([other for other in users if _served_fingerprints.peek(other) != fingerprint])
+    if not users:
+        del _fingerprint_users[fingerprint]
+        recommendation_cache.pop(fingerprint)
+
+def invalidate_recommendations(user_id: int) -> None:
+    """
+    Drop the results `user_id` was served; call after a habit write commits.
+
+    The entry stays while other users with the same habits still point at it.
+    """
+    fingerprint = _served_fingerprints.peek(user_id)
+    _served_fingerprints.pop(user_id)
+    if fingerprint is not None:
+        _release(user_id, fingerprint)
+
+def load_recommendation_cache(path: Optional[str] = settings.RECOMMENDATION_CACHE_PATH) -> int:
+    """Fill the cache from a snapshot saved by `save_recommendation_cache`"""
+    if not path or not os.path.exists(path):
+        return 0
+    try:
+        snapshot = orjson.loads(Path(path).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        logger.warning("Ignoring unreadable recommendation cache snapshot %s", path, exc_info=True)
+        return 0
+    elapsed = time.time() - snapshot["saved_at"]
+    recommendation_cache.load((key, value, ttl - elapsed) for key, value, ttl in snapshot["entries"])
+    return len(recommendation_cache)
+
+def save_recommendation_cache(path: Optional[str] = settings.RECOMMENDATION_CACHE_PATH) -> int:
+    """
+    Write the unexpired entries to `path`, replacing it atomically.
+
+    Every worker saves its own cache on shutdown; the last one to exit wins,
+    and each of them starts from that snapshot.
+    """
+    if not path:
+        return 0
+    entries = recommendation_cache.dump()
+    staging = f"{path}.{os.getpid()}.tmp"
+    Path(staging).write_bytes(orjson.dumps({"saved_at": time.time(), "entries": entries}))
+    os.replace(staging, path)
+    return len(entries)
\ No newline at end of file
@@ -0,0 +1,288 @@
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.locks import FileLock
+from app.core.timezones import DEFAULT_TIMEZONE, get_zone, to_local
+from app.db.session import async_session
+from app.models.habit import Habit
+from app.models.user import User
+from app.schemas.habit import HabitFrequency
+from app.services.habit_events import publish_habit_event
+from app.services.habit_versions import bump_habits_versions
+
+logger = logging.getLogger(__name__)
+
+def period_start(frequency: HabitFrequency, now: datetime) -> datetime:
+    """Start of the calendar period (day, ISO week or month) containing `now`, in `now`'s zone"""
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if frequency == HabitFrequency.DAILY:
+        return day_start
+    if frequency == HabitFrequency.WEEKLY:
+        return day_start - timedelta(days=now.weekday())
+    return day_start.replace(day=1)
+
+def next_period_start(frequency: HabitFrequency, now: datetime) -> datetime:
+    """Start of the calendar period following the one containing `now`"""
+    start = period_start(frequency, now)
+    if frequency == HabitFrequency.DAILY:
+        return start + timedelta(days=1)
+    if frequency == HabitFrequency.WEEKLY:
+        return start + timedelta(days=7)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+@lru_cache(maxsize=65536)
+def period_deadlines(zone_name: str, frequency: HabitFrequency, local_day: date) -> Tuple[datetime, datetime]:
+    """
+    UTC deadlines for a completion on `local_day` in the given zone.
+
+    Memoized per (zone, frequency, day): a reset run over many users computes
+    each zone's next midnight, week start and month start once, however many
+    habits share them. Local boundaries are converted back to UTC instants so
+    the reset queries stay plain range scans.
+    """
+    day_start = datetime.combine(local_day, time(0), tzinfo=get_zone(zone_name))
+    next_reset_at = next_period_start(frequency, day_start)
+    streak_expires_at = next_period_start(frequency, next_reset_at)
+    return next_reset_at.astimezone(timezone.utc), streak_expires_at.astimezone(timezone.utc)
+
+def reset_deadlines(
+    frequency: HabitFrequency,
+    completed_at: datetime,
+    zone_name: str = DEFAULT_TIMEZONE
+) -> Tuple[datetime, datetime]:
+    """
+    Deadlines materialized on a habit when it is completed at `completed_at`.
+
+    Returns (next_reset_at, streak_expires_at): the habit is un-completed when
+    its period ends in the user's local calendar, and the streak is lost if the
+    following period also ends without a completion. Naive datetimes (as read
+    back from SQLite) are treated as UTC.
+    """
+    local_day = to_local(completed_at, zone_name).date()
+    return period_deadlines(zone_name or DEFAULT_TIMEZONE, HabitFrequency(frequency), local_day)
+
+@dataclass
+class ResetSummary:
+    """Habits changed by a reset run, grouped by user id"""
+    uncompleted: Dict[int, List[int]] = field(default_factory=lambda: defaultdict(list))
+    streaks_lost: Dict[int, List[int]] = field(default_factory=lambda: defaultdict(list))
+
+    @property
+    def reset_count(self) -> int:
+        return sum(len(habit_ids) for habit_ids in self.uncompleted.values())
+
+    async def publish(self) -> None:
+        """Send each affected user a habits.reset event; call after commit"""
+        for user_id in self.uncompleted.keys() | self.streaks_lost.keys():
+            await publish_habit_event(user_id, "habits.reset", {
+                "uncompleted": self.uncompleted.get(user_id, []),
+                "streaks_lost": self.streaks_lost.get(user_id, []),
+            })
+
+async def reset_due_habits(
+    db: AsyncSession,
+    now: Optional[datetime] = None,
+    user_id: Optional[int] = None
+) -> ResetSummary:
+    """
+    Reset habits whose materialized deadlines have passed.
+
+    Both statements are range scans over (is_archived, deadline) indexes, so the
+    cost scales with the number of due habits rather than the total habit count.
+    Users with due habits get their habits version bumped first, so their
+    cached list and detail responses revalidate, and the changed habits are
+    collected with RETURNING for the change stream.
+    Pass `user_id` to limit the reset to a single user.
+    """
+    now = now or datetime.now(timezone.utc)
+    user_conditions = [Habit.user_id == user_id] if user_id is not None else []
+
+    await bump_habits_versions(
+        db,
+        select(Habit.user_id).where(
+            Habit.is_archived == False,
+            or_(Habit.streak_expires_at <= now, Habit.next_reset_at <= now),
+            *user_conditions
+        )
+    )
+
+    summary = ResetSummary()
+    result = await db.execute(
+        update(Habit)
+        .where(
+            Habit.is_archived == False,
+            Habit.streak_expires_at <= now,
+            *user_conditions
+        )
+        .values(streak=0, streak_expires_at=None)
+        .returning(Habit.user_id, Habit.id)
+        .execution_options(synchronize_session=False)
+    )
+    for owner_id, habit_id in result:
+        summary.streaks_lost[owner_id].append(habit_id)
+
+    result = await db.execute(
+        update(Habit)
+        .where(
+            Habit.is_archived == False,
+            Habit.next_reset_at <= now,
+            *user_conditions
+        )
+        .values(completed=False, next_reset_at=None)
+        .returning(Habit.user_id, Habit.id)
+        .execution_options(synchronize_session=False)
+    )
+    for owner_id, habit_id in result:
+        summary.uncompleted[owner_id].append(habit_id)
+    return summary
+
+async def backfill_reset_deadlines(db: AsyncSession) -> int:
+    """
+    Materialize deadlines for habits written before they were tracked.
+
+    Only touches completed habits without next_reset_at and streaking habits
+    without streak_expires_at, so it is a no-op once every row is populated.
+    """
+    result = await db.execute(
+        select(
+            Habit.id,
+            Habit.frequency,
+            Habit.completed,
+            Habit.streak,
+            func.coalesce(Habit.last_completed, Habit.created_at),
+            User.timezone
+        )
+        .join(User, User.id == Habit.user_id)
+        .where(
+            or_(
+                and_(Habit.completed == True, Habit.next_reset_at.is_(None)),
+                and_(Habit.streak > 0, Habit.streak_expires_at.is_(None))
+            )
+        )
+    )
+
+    updates = []
+    for habit_id, frequency, completed, streak, last_activity, zone_name in result:
+        next_reset_at, streak_expires_at = reset_deadlines(
+            HabitFrequency(frequency), last_activity, zone_name
+        )
+        updates.append({
+            "id": habit_id,
+            "next_reset_at": next_reset_at if completed else None,
+            "streak_expires_at": streak_expires_at if streak > 0 else None,
+        })
+
+    if updates:
+        await db.execute(update(Habit), updates)
+    return len(updates)
+
+class HabitResetEngine:
+    """
+    Background task that resets habits for all users.
+
+    Backfills missing deadlines and runs once on start-up to catch up on
+    boundaries missed while the server was down, then sleeps until the next
+    period boundary. Boundaries are local midnights, and every current IANA
+    zone offset is a whole number of quarter hours, so waking at each UTC
+    quarter hour covers all users and frequencies. The sleep is capped at
+    RESET_ENGINE_MAX_INTERVAL_SECONDS as a safety net against clock drift.
+
+    With several worker processes only the one holding RESET_ENGINE_LOCK_PATH
+    runs; the others stand by and retry the lock at every boundary, so one
+    of them takes over if the leader exits. Each sweep publishes its
+    habits.reset events from the leader, so they reach streams on other
+    workers only through a shared event broker.
+    """
+
+    def __init__(
+        self,
+        session_factory=async_session,
+        max_interval: Optional[int] = None,
+        lock_path: Optional[str] = settings.RESET_ENGINE_LOCK_PATH
+    ):
+        self._session_factory = session_factory
+        self._max_interval = max_interval or settings.RESET_ENGINE_MAX_INTERVAL_SECONDS
+        self._lock = FileLock(lock_path) if lock_path else None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """Reset due habits across all users in a single transaction and notify their streams"""
+        async with self._session_factory() as db:
+            summary = await reset_due_habits(db, now)
+            await db.commit()
+        await summary.publish()
+        return summary.reset_count
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        boundary = now.replace(minute=now.minute - now.minute % 15, second=0, microsecond=0)
+        boundary += timedelta(minutes=15)
+        # Wake slightly after the boundary so the new period has started
+        delay = (boundary - now).total_seconds() + 1
+        return min(delay, self._max_interval)
+
+    async def backfill(self) -> int:
+        async with self._session_factory() as db:
+            backfilled = await backfill_reset_deadlines(db)
+            await db.commit()
+        return backfilled
+
+    async def _sleep_until_next_run(self) -> None:
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=self.seconds_until_next_run())
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        if self._lock is not None and not self._lock.acquire():
+            logger.info("Reset engine standing by; another process holds %s", self._lock.path)
+            while True:
+                await self._sleep_until_next_run()
+                if self._stop.is_set():
+                    return
+                if self._lock.acquire():
+                    break
+            logger.info("Reset engine took over from the previous leader")
+
+        try:
+            backfilled = await self.backfill()
+            if backfilled:
+                logger.info("Backfilled reset deadlines for %d habits", backfilled)
+        except Exception:
+            logger.exception("Reset deadline backfill failed")
+
+        while not self._stop.is_set():
+            try:
+                reset_count = await self.run_once()
+                if reset_count:
+                    logger.info("Reset %d habits", reset_count)
+            except Exception:
+                logger.exception("Habit reset run failed")
+
+            await self._sleep_until_next_run()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+        if self._lock is not None:
+            self._lock.release()
+
+reset_engine = HabitResetEngine()
\ No newline at end of file
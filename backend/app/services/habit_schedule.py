@@ -0,0 +1,135 @@
+"""
+Scheduled periods: the denominator of completion rates.
+
+A habit is due once per period of its frequency (local day, ISO week or
+calendar month), from the local day it was created through today. The
+period in progress only counts once it is completed, so a habit not done yet
+today does not lower today's rate. Archived habits carry no archive date, so
+they count as due until their last logged day. Nothing is written for missed
+periods; they are derived here from the frequency and that active window.
+
+Day numbers (days since 1970-01-01) are used throughout so that whole
+windows are handled as NumPy arrays. A period that a window cuts counts
+once, attributed to its first day inside the window, and counts as completed
+when any of its days inside the window has a completed log. Multiple
+completions in one period count once.
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.timezones import to_local
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.schemas.habit import HabitFrequency
+
+EPOCH = date(1970, 1, 1)
+# 1970-01-01 was a Thursday; weekday() numbers Monday as 0
+EPOCH_WEEKDAY = EPOCH.weekday()
+
+# Period unit of each frequency, named like HabitHistoryBucket values
+FREQUENCY_UNITS = {
+    HabitFrequency.DAILY: "day",
+    HabitFrequency.WEEKLY: "week",
+    HabitFrequency.MONTHLY: "month",
+}
+
+def day_number(day: date) -> int:
+    return (day - EPOCH).days
+
+def from_day_number(number: int) -> date:
+    return EPOCH + timedelta(days=int(number))
+
+def period_starts(unit: str, days: np.ndarray) -> np.ndarray:
+    """Day number of the first day of the day, week or month holding each day number"""
+    days = np.asarray(days, dtype=np.int64)
+    if unit == "day":
+        return days
+    if unit == "week":
+        return days - (days + EPOCH_WEEKDAY) % 7
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+def due_window(
+    created_at: datetime,
+    is_archived: bool,
+    last_logged: Optional[date],
+    zone_name: str,
+    start: date,
+    end: date,
+    today: date
+) -> Tuple[int, int]:
+    """
+    First and last day numbers within `start`..`end` on which a habit was due;
+    the first exceeds the last when it was not due at all.
+    """
+    last = min(end, today)
+    if is_archived:
+        if last_logged is None:
+            return 1, 0
+        last = min(last, last_logged)
+    first = max(start, to_local(created_at, zone_name).date())
+    return day_number(first), day_number(last)
+
+def habit_periods(
+    frequency: str,
+    completed_days: np.ndarray,
+    first: int,
+    last: int,
+    today: date
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Attribution day numbers of a habit's (due, completed) periods within
+    `first`..`last`, given the day numbers of its completed logs.
+    """
+    if first > last:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    unit = FREQUENCY_UNITS[HabitFrequency(frequency)]
+    due = np.unique(np.maximum(period_starts(unit, np.arange(first, last + 1)), first))
+    completed_days = np.asarray(completed_days, dtype=np.int64)
+    completed_days = completed_days[(completed_days >= first) & (completed_days <= last)]
+    completed = np.unique(np.maximum(period_starts(unit, completed_days), first))
+
+    in_progress = max(int(period_starts(unit, [day_number(today)])[0]), first)
+    if in_progress <= last and not np.isin(in_progress, completed):
+        due = due[due != in_progress]
+    return due, completed
+
+async def load_due_windows(
+    db: AsyncSession,
+    user_id: int,
+    zone_name: str,
+    today: date,
+    start: date,
+    end: date,
+    habit_id: Optional[int] = None
+) -> List[Tuple[object, int, int]]:
+    """
+    (habit, first, last) for each of the user's habits in id order, or just
+    `habit_id` if given, where habit has id, title, category and frequency
+    and first..last are the day numbers it was due within `start`..`end`.
+    """
+    conditions = [Habit.user_id == user_id]
+    if habit_id is not None:
+        conditions.append(Habit.id == habit_id)
+    habits = (await db.execute(
+        select(Habit.id, Habit.title, Habit.category, Habit.frequency, Habit.created_at, Habit.is_archived)
+        .where(*conditions)
+        .order_by(Habit.id)
+    )).all()
+    archived = [habit.id for habit in habits if habit.is_archived]
+    last_logged = dict((await db.execute(
+        select(HabitLog.habit_id, func.max(HabitLog.date))
+        .where(HabitLog.habit_id.in_(archived))
+        .group_by(HabitLog.habit_id)
+    )).all()) if archived else {}
+
+    return [
+        (habit, *due_window(
+            habit.created_at, habit.is_archived, last_logged.get(habit.id), zone_name, start, end, today
+        ))
+        for habit in habits
+    ]
\ No newline at end of file
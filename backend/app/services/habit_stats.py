@@ -0,0 +1,137 @@
+"""
+Completion statistics served from the habit_daily_stats rollup.
+
+Log writes keep the rollup current (see habit_logs.upsert_logs); rows from
+before the rollup existed are filled in by `backfill_daily_stats`. The
+rollup only records completions; scheduled periods are derived from each
+habit's frequency (see habit_schedule).
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.habit import Habit
+from app.models.habit_daily_stat import HabitDailyStat
+from app.models.habit_log import HabitLog
+from app.schemas.habit import (
+    HabitHistoryBucket,
+    HabitStatsByHabit,
+    HabitStatsPoint,
+    HabitStatsResponse,
+    HabitStatsTotals
+)
+from app.services.habit_logs import upsert_daily_stats
+from app.services.habit_schedule import (
+    day_number,
+    from_day_number,
+    habit_periods,
+    load_due_windows,
+    period_starts
+)
+
+def _rate(completions: int, scheduled: int) -> float:
+    return round(completions / scheduled, 4) if scheduled else 0.0
+
+def _totals(counts) -> Dict[str, object]:
+    completions, scheduled = counts
+    return {"completions": completions, "scheduled": scheduled, "completion_rate": _rate(completions, scheduled)}
+
+async def backfill_daily_stats(db: AsyncSession, batch_size: int = 5000) -> int:
+    """
+    Build habit_daily_stats from every existing habit log.
+
+    Logs are streamed in (habit_id, date) order and upserted in chunks of
+    `batch_size`, so memory stays flat however long the history is. Upserts
+    make the backfill safe to re-run, including alongside live writes.
+    Returns the number of rows written.
+    """
+    rows = await db.stream(
+        select(Habit.user_id, HabitLog.habit_id, HabitLog.date, HabitLog.completed)
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .order_by(HabitLog.habit_id, HabitLog.date)
+        .execution_options(yield_per=batch_size)
+    )
+
+    written = 0
+    async for partition in rows.partitions():
+        await upsert_daily_stats(db, [
+            {
+                "user_id": user_id,
+                "habit_id": habit_id,
+                "date": day,
+                "completions": 1 if completed else 0,
+            }
+            for user_id, habit_id, day, completed in partition
+        ])
+        written += len(partition)
+    return written
+
+async def compute_habit_stats(
+    db: AsyncSession,
+    user_id: int,
+    zone_name: str,
+    today: date,
+    start: date,
+    end: date,
+    bucket: HabitHistoryBucket
+) -> HabitStatsResponse:
+    """
+    Completion counts and rates of a user's habits between `start` and `end`;
+    `today` is the user's local date.
+
+    Completed days come from one range scan of the covering (user_id, date)
+    index of the rollup; scheduled periods are derived from each habit's
+    frequency and active window (app/services/habit_schedule.py), so missed
+    periods count even though nothing was logged for them. Totals, per-habit,
+    per-category and series figures are folded from per-habit period arrays.
+    """
+    windows = await load_due_windows(db, user_id, zone_name, today, start, end)
+
+    completed_days = defaultdict(list)
+    result = await db.execute(
+        select(HabitDailyStat.habit_id, HabitDailyStat.date)
+        .where(
+            HabitDailyStat.user_id == user_id,
+            HabitDailyStat.date.between(start, end),
+            HabitDailyStat.completions > 0
+        )
+    )
+    for habit_id, day in result:
+        completed_days[habit_id].append(day_number(day))
+
+    totals = [0, 0]
+    by_habit = []
+    by_category = defaultdict(lambda: [0, 0])
+    series = defaultdict(lambda: [0, 0])
+    for habit, first, last in windows:
+        due, completed = habit_periods(habit.frequency, completed_days[habit.id], first, last, today)
+        if not len(due):
+            continue
+        counts = [len(completed), len(due)]
+        for index, periods in enumerate((completed, due)):
+            buckets, bucket_counts = np.unique(period_starts(bucket.value, periods), return_counts=True)
+            for period, count in zip(buckets.tolist(), bucket_counts.tolist()):
+                series[period][index] += count
+        for aggregate in (totals, by_category[habit.category]):
+            aggregate[0] += counts[0]
+            aggregate[1] += counts[1]
+        by_habit.append(HabitStatsByHabit(
+            habit_id=habit.id, title=habit.title, category=habit.category, **_totals(counts)
+        ))
+
+    return HabitStatsResponse(
+        bucket=bucket,
+        start=start,
+        end=end,
+        totals=HabitStatsTotals(**_totals(totals)),
+        by_habit=by_habit,
+        by_category={category: HabitStatsTotals(**_totals(counts)) for category, counts in by_category.items()},
+        series=[
+            HabitStatsPoint(period=from_day_number(period), **_totals(counts))
+            for period, counts in sorted(series.items())
+        ],
+    )
\ No newline at end of file
@@ -0,0 +1,75 @@
+from collections import defaultdict
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.habit import Habit
+from app.schemas.habit import HabitCountSummary, HabitSummaryResponse
+
+# Summaries keyed by (user id, habits version). Every habit write bumps the
+# version, so a write invalidates the user's entry and the stale one ages out.
+summary_cache = TTLCache(
+    maxsize=settings.SUMMARY_CACHE_MAXSIZE,
+    ttl=settings.SUMMARY_CACHE_TTL_SECONDS
+)
+
+async def compute_habit_summary(db: AsyncSession, user_id: int) -> HabitSummaryResponse:
+    """
+    Dashboard counts and streak statistics from one grouped query.
+
+    Groups the user's habits by (category, frequency, completed, is_archived)
+    and folds the handful of groups into the response in Python. Archived
+    habits are only counted in `archived`.
+    """
+    result = await db.execute(
+        select(
+            Habit.category,
+            Habit.frequency,
+            Habit.completed,
+            Habit.is_archived,
+            func.count().label("habits"),
+            func.coalesce(func.sum(Habit.streak), 0).label("streak_sum"),
+            func.coalesce(func.max(Habit.streak), 0).label("streak_max"),
+            func.coalesce(func.max(Habit.longest_streak), 0).label("longest_streak"),
+        )
+        .where(Habit.user_id == user_id)
+        .group_by(Habit.category, Habit.frequency, Habit.completed, Habit.is_archived)
+    )
+
+    total = completed = archived = streak_sum = max_streak = longest_streak = 0
+    by_category = defaultdict(lambda: HabitCountSummary(total=0, completed=0))
+    by_frequency = defaultdict(lambda: HabitCountSummary(total=0, completed=0))
+    for row in result:
+        if row.is_archived:
+            archived += row.habits
+            continue
+        done = row.habits if row.completed else 0
+        total += row.habits
+        completed += done
+        for group in (by_category[row.category], by_frequency[row.frequency]):
+            group.total += row.habits
+            group.completed += done
+        streak_sum += row.streak_sum
+        max_streak = max(max_streak, row.streak_max)
+        longest_streak = max(longest_streak, row.longest_streak)
+
+    return HabitSummaryResponse(
+        total=total,
+        completed=completed,
+        archived=archived,
+        by_category=dict(by_category),
+        by_frequency=dict(by_frequency),
+        max_streak=max_streak,
+        avg_streak=round(streak_sum / total, 2) if total else 0.0,
+        longest_streak=longest_streak,
+    )
+
+async def get_habit_summary(db: AsyncSession, user_id: int, version: int) -> HabitSummaryResponse:
+    """Summary for `user_id` at habits `version`, computed at most once per version"""
+    summary = summary_cache.get((user_id, version))
+    if summary is None:
+        summary = await compute_habit_summary(db, user_id)
+        summary_cache.set((user_id, version), summary)
+    return summary
\ No newline at end of file
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+def _bumped_version():
+    # Keep users.updated_at for profile changes; this is not one
+    return {"habits_version": User.habits_version + 1, "updated_at": User.updated_at}
+
+async def bump_habits_version(db: AsyncSession, user_id: int) -> None:
+    """
+    Mark a user's habits as changed, invalidating their list and detail ETags.
+
+    Call it in the same transaction as every habit write. It is a Core UPDATE,
+    so it does not fire the ORM events that evict the user from the auth cache.
+    """
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(**_bumped_version())
+        .execution_options(synchronize_session=False)
+    )
+
+async def bump_habits_versions(db: AsyncSession, user_ids) -> None:
+    """Bump the version of every user matched by `user_ids`, a list or a SELECT of ids"""
+    await db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(**_bumped_version())
+        .execution_options(synchronize_session=False)
+    )
+
+async def get_habits_version(db: AsyncSession, user_id: int) -> Optional[int]:
+    """Current habits version of a user, a single primary key lookup"""
+    return await db.scalar(select(User.habits_version).where(User.id == user_id))
\ No newline at end of file
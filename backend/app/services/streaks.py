@@ -0,0 +1,213 @@
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.timezones import DEFAULT_TIMEZONE, to_local
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.models.user import User
+from app.schemas.habit import HabitFrequency
+from app.services.habit_reset import period_deadlines
+from app.services.habit_versions import bump_habits_versions
+
+def period_index(frequency: HabitFrequency, day: date) -> int:
+    """
+    Number the calendar periods of a frequency so consecutive periods differ by one.
+
+    Days are numbered by ordinal, weeks by their Monday's ordinal and months
+    by year * 12 + month.
+    """
+    if frequency == HabitFrequency.DAILY:
+        return day.toordinal()
+    if frequency == HabitFrequency.WEEKLY:
+        return (day.toordinal() - day.weekday()) // 7
+    return day.year * 12 + day.month - 1
+
+def advance_streak(
+    frequency: HabitFrequency,
+    streak: int,
+    longest: int,
+    previous_completion: Optional[date],
+    completed_on: date
+) -> Tuple[int, int]:
+    """
+    Apply a new completion to (current, longest) streaks in O(1).
+
+    A completion in the period right after the previous completion extends the
+    streak, another completion in the same period leaves it unchanged, and
+    anything later starts a new streak.
+    """
+    if previous_completion is None:
+        streak = 1
+    else:
+        gap = period_index(frequency, completed_on) - period_index(frequency, previous_completion)
+        if gap == 0:
+            streak = max(streak, 1)
+        elif gap == 1:
+            streak += 1
+        else:
+            streak = 1
+    return streak, max(longest, streak)
+
+def streaks_from_dates(frequency: HabitFrequency, dates: Iterable[date], today: date) -> Tuple[int, int, Optional[date]]:
+    """
+    Compute (current, longest, last completion) from ascending completion dates in one pass.
+
+    The current streak only counts if its last period is the current or the
+    previous one; otherwise it has already expired.
+    """
+    current = longest = 0
+    last_index = None
+    last_date = None
+    for day in dates:
+        index = period_index(frequency, day)
+        if index == last_index:
+            continue
+        current = current + 1 if last_index is not None and index == last_index + 1 else 1
+        longest = max(longest, current)
+        last_index, last_date = index, day
+
+    if last_index is None or period_index(frequency, today) - last_index > 1:
+        current = 0
+    return current, longest, last_date
+
+async def last_completion_on_or_before(db: AsyncSession, habit_id: int, day: date) -> Optional[date]:
+    """
+    Most recent completed log up to and including `day`, via the (habit_id, date) index.
+
+    Including `day` makes a repeated completion in the same period a no-op for
+    advance_streak rather than counting the period twice.
+    """
+    return await db.scalar(
+        select(func.max(HabitLog.date)).where(
+            HabitLog.habit_id == habit_id,
+            HabitLog.completed == True,
+            HabitLog.date <= day
+        )
+    )
+
+async def latest_completions(db: AsyncSession, habit_ids: Iterable[int]) -> Dict[int, date]:
+    """Most recent completed log date of each habit, in one grouped query"""
+    result = await db.execute(
+        select(HabitLog.habit_id, func.max(HabitLog.date))
+        .where(HabitLog.habit_id.in_(list(habit_ids)), HabitLog.completed == True)
+        .group_by(HabitLog.habit_id)
+    )
+    return dict(result.all())
+
+async def rebuild_habit_streak(
+    db: AsyncSession,
+    habit: Habit,
+    today: date,
+    zone_name: str = DEFAULT_TIMEZONE
+) -> None:
+    """
+    Recompute one habit's streaks from its log, e.g. after a completion is undone.
+
+    `today` is the user's local date. Sets streak, longest_streak and
+    streak_expires_at on the habit.
+    """
+    result = await db.stream_scalars(
+        select(HabitLog.date)
+        .where(HabitLog.habit_id == habit.id, HabitLog.completed == True)
+        .order_by(HabitLog.date)
+    )
+    frequency = HabitFrequency(habit.frequency)
+    dates = [day async for day in result]
+    habit.streak, habit.longest_streak, last_date = streaks_from_dates(frequency, dates, today)
+    habit.streak_expires_at = (
+        period_deadlines(zone_name, frequency, last_date)[1] if habit.streak else None
+    )
+
+async def rebuild_streak_states(
+    db: AsyncSession,
+    states: Dict[int, dict],
+    today: date,
+    zone_name: str = DEFAULT_TIMEZONE
+) -> None:
+    """
+    Recompute the streaks of several habits of one user from their logs in one query.
+
+    `states` maps habit ids to dicts with a "frequency" key, as used by the batch
+    endpoint; streak, longest_streak and streak_expires_at are set on each dict.
+    """
+    if not states:
+        return
+    dates = {habit_id: [] for habit_id in states}
+    result = await db.stream(
+        select(HabitLog.habit_id, HabitLog.date)
+        .where(HabitLog.habit_id.in_(list(states)), HabitLog.completed == True)
+        .order_by(HabitLog.habit_id, HabitLog.date)
+    )
+    async for habit_id, day in result:
+        dates[habit_id].append(day)
+
+    for habit_id, state in states.items():
+        frequency = HabitFrequency(state["frequency"])
+        streak, longest, last_date = streaks_from_dates(frequency, dates[habit_id], today)
+        state["streak"], state["longest_streak"] = streak, longest
+        state["streak_expires_at"] = period_deadlines(zone_name, frequency, last_date)[1] if streak else None
+
+async def recompute_all_streaks(db: AsyncSession, today: Optional[date] = None, batch_size: int = 1000) -> int:
+    """
+    Rebuild every habit's streaks from habit_logs in one streaming pass.
+
+    Completed logs are streamed ordered by (habit_id, date), so memory stays
+    bounded by one habit's run and updates are flushed in batches. Streaks are
+    judged against each user's local date, computed once per zone.
+    Returns the number of habits with at least one completion.
+    """
+    now = datetime.now(timezone.utc)
+    local_today = {}
+    await db.execute(
+        update(Habit)
+        .values(streak=0, longest_streak=0, streak_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    rows = await db.stream(
+        select(HabitLog.habit_id, Habit.frequency, User.timezone, HabitLog.date)
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .join(User, User.id == Habit.user_id)
+        .where(HabitLog.completed == True)
+        .order_by(HabitLog.habit_id, HabitLog.date)
+        .execution_options(yield_per=batch_size * 10)
+    )
+
+    updates = []
+    rebuilt = 0
+
+    def finish(habit_id: int, frequency: str, zone_name: str, dates: list) -> None:
+        frequency = HabitFrequency(frequency)
+        if zone_name not in local_today:
+            local_today[zone_name] = today or to_local(now, zone_name).date()
+        streak, longest, last_date = streaks_from_dates(frequency, dates, local_today[zone_name])
+        updates.append({
+            "id": habit_id,
+            "streak": streak,
+            "longest_streak": longest,
+            "streak_expires_at": period_deadlines(zone_name, frequency, last_date)[1] if streak else None,
+        })
+
+    current_id, current_frequency, current_zone, dates = None, None, None, []
+    async for habit_id, frequency, zone_name, day in rows:
+        if habit_id != current_id:
+            if current_id is not None:
+                finish(current_id, current_frequency, current_zone, dates)
+                rebuilt += 1
+            current_id, current_frequency, current_zone, dates = habit_id, frequency, zone_name, []
+        dates.append(day)
+
+        if len(updates) >= batch_size:
+            await db.execute(update(Habit), updates)
+            updates = []
+
+    if current_id is not None:
+        finish(current_id, current_frequency, current_zone, dates)
+        rebuilt += 1
+    if updates:
+        await db.execute(update(Habit), updates)
+    await bump_habits_versions(db, select(Habit.user_id))
+    return rebuilt
\ No newline at end of file
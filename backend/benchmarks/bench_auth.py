@@ -0,0 +1,85 @@
+"""
+Micro-benchmark for per-request authentication cost.
+
+Compares the previous auth path (decode the JWT, then look the user up by
+email on every request) with the shared get_current_user dependency, with the
+user cache and with stateless tokens.
+
+    python benchmarks/bench_auth.py [--requests 5000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent)
+sys.path.append(backend_dir)
+
+# Never benchmark against the real database
+_db_file = os.path.join(tempfile.mkdtemp(), "bench_auth.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_file}"
+
+from jose import jwt
+from sqlalchemy import select
+
+from app.core import auth
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.db.session import engine, async_session
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+async def legacy_auth(token: str, db) -> UserResponse:
+    """The auth path before the dependency was unified and cached"""
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    result = await db.execute(select(User).where(User.email == payload["sub"]))
+    return UserResponse.model_validate(result.scalar_one())
+
+async def current_auth(token: str, db) -> UserResponse:
+    payload = await auth.get_token_payload(token)
+    return await auth.get_current_user(token, payload, db)
+
+async def measure(label: str, fn, token: str, requests: int) -> None:
+    start = time.perf_counter()
+    for _ in range(requests):
+        # One session per request, as the session dependencies do
+        async with async_session() as db:
+            await fn(token, db)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / requests * 1e6:9.1f} us/request")
+
+async def main(requests: int) -> None:
+    engine.echo = False
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_session() as db:
+        user = User(email="bench@example.com", full_name="Bench User", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+
+    settings.AUTH_STATELESS_TOKENS = False
+    token = create_access_token(auth.token_claims(user))
+    await measure("before (decode + lookup)", legacy_auth, token, requests)
+
+    auth.user_cache.clear()
+    await measure("after (cached dependency)", current_auth, token, requests)
+    print(f"{'':<28} cache {auth.user_cache.stats()}")
+
+    settings.AUTH_STATELESS_TOKENS = True
+    stateless_token = create_access_token(auth.token_claims(user))
+    await measure("after (stateless token)", current_auth, stateless_token, requests)
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
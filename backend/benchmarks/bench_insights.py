@@ -0,0 +1,179 @@
+"""
+Benchmark for GET /api/habits/insights over a long history.
+
+Seeds one user with --habits habits logged every day for --years years and
+compares a per-row Python implementation of the metrics (ORM log objects,
+dict accumulators, as a straightforward endpoint would do it) with the
+current path: one column query into a NumPy array and vectorized metrics.
+Loading and computing are timed separately and the results are compared.
+
+    python benchmarks/bench_insights.py [--years 5] [--habits 50] [--runs 3]
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, time as dt_time, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent)
+sys.path.append(backend_dir)
+
+# Never benchmark against the real database
+_db_file = os.path.join(tempfile.mkdtemp(), "bench_insights.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_file}"
+
+import numpy as np
+from sqlalchemy import insert, select
+
+from app.db.base import Base
+from app.db.session import engine, async_session
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.models.user import User
+from app.services.habit_insights import (
+    RECENCY_HALF_LIFE_DAYS,
+    TIMING_SPREAD_MINUTES,
+    compute_insights,
+    load_log_columns
+)
+from app.services.habit_schedule import load_due_windows
+
+async def seed(years: int, habit_count: int, end: date) -> int:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(42)
+    days = years * 365 + years // 4
+    async with async_session() as db:
+        user = User(email="bench@example.com", full_name="Bench User", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        habit_ids = (await db.scalars(
+            insert(Habit).returning(Habit.id),
+            [
+                {
+                    "user_id": user.id,
+                    "title": f"Habit {i}",
+                    "description": "",
+                    "frequency": "daily",
+                    "category": "Health",
+                    "created_at": datetime.combine(end - timedelta(days=days - 1), dt_time(0)),
+                }
+                for i in range(habit_count)
+            ]
+        )).all()
+        for habit_id in habit_ids:
+            rate = rng.uniform(0.4, 0.95)
+            usual_minute = rng.randrange(5 * 60, 22 * 60)
+            rows = []
+            for offset in range(days):
+                completed = rng.random() < rate
+                minute = min(max(int(rng.gauss(usual_minute, 45)), 0), 24 * 60 - 1)
+                rows.append({
+                    "habit_id": habit_id,
+                    "date": end - timedelta(days=offset),
+                    "completed": completed,
+                    "completion_time": dt_time(minute // 60, minute % 60) if completed and offset % 10 else None,
+                })
+            await db.execute(insert(HabitLog), rows)
+        await db.commit()
+        return user.id
+
+async def load_naive(user_id: int, start: date, end: date):
+    async with async_session() as db:
+        return (await db.scalars(
+            select(HabitLog)
+            .join(Habit, Habit.id == HabitLog.habit_id)
+            .where(Habit.user_id == user_id, HabitLog.date.between(start, end))
+        )).all()
+
+def compute_naive(logs, end: date) -> dict:
+    """The same metrics with a Python loop over the logs"""
+    due = defaultdict(int)
+    completions = defaultdict(int)
+    weighted = defaultdict(float)
+    weighted_done = defaultdict(float)
+    times = defaultdict(list)
+    for log in logs:
+        # Every day is due except today until it is completed
+        if log.date == end and not log.completed:
+            continue
+        weight = 0.5 ** ((end - log.date).days / RECENCY_HALF_LIFE_DAYS)
+        due[log.habit_id] += 1
+        weighted[log.habit_id] += weight
+        if log.completed:
+            completions[log.habit_id] += 1
+            weighted_done[log.habit_id] += weight
+            if log.completion_time is not None:
+                times[log.habit_id].append(log.completion_time.hour * 60 + log.completion_time.minute)
+
+    rates, scores = {}, {}
+    for habit_id in due:
+        rates[habit_id] = completions[habit_id] / due[habit_id]
+        minutes = times[habit_id]
+        regularity = 0.0
+        if minutes:
+            mean = sum(minutes) / len(minutes)
+            spread = math.sqrt(sum((m - mean) ** 2 for m in minutes) / len(minutes))
+            regularity = min(max(1 - spread / TIMING_SPREAD_MINUTES, 0), 1)
+        scores[habit_id] = round(100 * (0.7 * weighted_done[habit_id] / weighted[habit_id] + 0.3 * regularity))
+    return {"rates": rates, "scores": scores}
+
+async def load_columns(user_id: int, start: date, end: date):
+    async with async_session() as db:
+        windows = await load_due_windows(db, user_id, "UTC", end, start, end)
+        return await load_log_columns(db, user_id, start, end), [
+            (habit.id, habit.frequency, first, last) for habit, first, last in windows
+        ]
+
+def compute_columns(data, end: date) -> dict:
+    columns, windows = data
+    return compute_insights(columns, windows, end, end)
+
+async def measure(label: str, load, compute, runs: int, user_id: int, start: date, end: date):
+    load_seconds = compute_seconds = 0.0
+    for _ in range(runs):
+        began = time.perf_counter()
+        data = await load(user_id, start, end)
+        loaded = time.perf_counter()
+        result = compute(data, end)
+        compute_seconds += time.perf_counter() - loaded
+        load_seconds += loaded - began
+    print(
+        f"{label:<24} load {load_seconds / runs * 1e3:8.1f} ms"
+        f"  compute {compute_seconds / runs * 1e3:8.1f} ms"
+        f"  total {(load_seconds + compute_seconds) / runs * 1e3:8.1f} ms"
+    )
+    return result
+
+async def main(years: int, habit_count: int, runs: int) -> None:
+    engine.echo = False
+    end = datetime.now().date()
+    user_id = await seed(years, habit_count, end)
+    start = end - timedelta(days=years * 365 + years // 4 - 1)
+    print(f"{habit_count} habits x {(end - start).days + 1} days\n")
+
+    naive = await measure("before (ORM + loop)", load_naive, compute_naive, runs, user_id, start, end)
+    current = await measure("after (columns + numpy)", load_columns, compute_columns, runs, user_id, start, end)
+
+    ids = current["habit_ids"].tolist()
+    assert np.allclose(current["completion_rates"], [naive["rates"][i] for i in ids])
+    # Scores are rounded; float summation order can move one across .5
+    assert np.abs(current["consistency_scores"] - [naive["scores"][i] for i in ids]).max() <= 1
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--habits", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.years, args.habits, args.runs))
\ No newline at end of file
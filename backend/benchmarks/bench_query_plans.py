@@ -0,0 +1,142 @@
+"""
+Query plan check for the habit access paths.
+
+Seeds a throwaway SQLite database, then runs EXPLAIN QUERY PLAN and times each
+query the routes and the reset engine issue. Exits non-zero if any of them
+falls back to a full table scan.
+
+    python benchmarks/bench_query_plans.py [--users 200] [--habits 20] [--days 90]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent)
+sys.path.append(backend_dir)
+
+# Never benchmark against the real database
+_db_file = os.path.join(tempfile.mkdtemp(), "bench_query_plans.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_file}"
+
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.dialects import sqlite
+
+from app.db.base import Base
+from app.db.session import engine
+from app.models.habit import Habit
+from app.models.habit_daily_stat import HabitDailyStat
+from app.models.habit_log import HabitLog
+from app.models.user import User
+
+FREQUENCIES = ["daily", "weekly", "monthly"]
+CATEGORIES = ["Mindfulness", "Learning", "Productivity", "Health", "Fitness", "Career", "Social", "Other"]
+
+async def seed(users: int, habits: int, days: int) -> None:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"id": u, "email": f"user{u}@example.com", "full_name": f"User {u}", "hashed_password": "x"}
+            for u in range(1, users + 1)
+        ])
+        habit_rows = []
+        for u in range(1, users + 1):
+            for h in range(habits):
+                completed = rng.random() < 0.5
+                habit_rows.append({
+                    "id": len(habit_rows) + 1,
+                    "user_id": u,
+                    "title": f"Habit {h}",
+                    "description": "Seeded habit",
+                    "frequency": rng.choice(FREQUENCIES),
+                    "category": rng.choice(CATEGORIES),
+                    "created_at": now - timedelta(days=rng.randint(0, days), seconds=rng.randint(0, 86400)),
+                    "streak": rng.randint(0, 30),
+                    "completed": completed,
+                    "is_archived": rng.random() < 0.2,
+                    "next_reset_at": now + timedelta(hours=rng.randint(-48, 48)) if completed else None,
+                    "streak_expires_at": now + timedelta(days=rng.randint(-2, 30)),
+                })
+        await conn.execute(insert(Habit), habit_rows)
+        await conn.execute(insert(HabitLog), [
+            {"habit_id": habit["id"], "date": today - timedelta(days=d), "completed": rng.random() < 0.7}
+            for habit in habit_rows
+            for d in range(days)
+        ])
+        await conn.exec_driver_sql("ANALYZE")
+
+def access_paths(user_id: int, habit_id: int):
+    now = datetime.now(timezone.utc)
+    listing = [Habit.user_id == user_id, Habit.is_archived == False]
+    return {
+        "list habits": select(Habit).where(*listing)
+            .order_by(Habit.created_at.desc(), Habit.id.desc()).limit(10),
+        "list habits (cursor)": select(Habit).where(*listing, or_(
+                Habit.created_at < now,
+                and_(Habit.created_at == now, Habit.id < habit_id)
+            )).order_by(Habit.created_at.desc(), Habit.id.desc()).limit(10),
+        "list by category": select(Habit).where(*listing, Habit.category == "Health"),
+        "list by frequency": select(Habit).where(*listing, Habit.frequency == "weekly"),
+        "list by completed": select(Habit).where(*listing, Habit.completed == True),
+        "get habit": select(Habit).where(Habit.id == habit_id, Habit.user_id == user_id),
+        "reset due": select(Habit.id).where(Habit.is_archived == False, Habit.next_reset_at <= now),
+        "streak due": select(Habit.id).where(Habit.is_archived == False, Habit.streak_expires_at <= now),
+        "habit log range": select(HabitLog).where(
+            HabitLog.habit_id == habit_id,
+            HabitLog.date.between(date.today() - timedelta(days=30), date.today())
+        ),
+        "daily stats range": select(HabitDailyStat.habit_id, func.sum(HabitDailyStat.completions)).where(
+            HabitDailyStat.user_id == user_id,
+            HabitDailyStat.date.between(date.today() - timedelta(days=30), date.today())
+        ).group_by(HabitDailyStat.habit_id),
+        "user by email": select(User).where(User.email == f"user{user_id}@example.com"),
+    }
+
+async def main(users: int, habits: int, days: int) -> int:
+    engine.echo = False
+    start = time.perf_counter()
+    await seed(users, habits, days)
+    print(f"Seeded {users} users x {habits} habits x {days} days in {time.perf_counter() - start:.1f}s\n")
+
+    full_scans = 0
+    async with engine.connect() as conn:
+        for name, statement in access_paths(user_id=users // 2, habit_id=users * habits // 2).items():
+            compiled = statement.compile(dialect=sqlite.dialect())
+            params = compiled.construct_params()
+            sql = str(compiled)
+
+            plan = await conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}",
+                tuple(params[key] for key in compiled.positiontup)
+            )
+            details = [row[-1] for row in plan]
+
+            start = time.perf_counter()
+            await conn.execute(statement)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            scanned = any(detail.startswith("SCAN") and "INDEX" not in detail for detail in details)
+            full_scans += scanned
+            print(f"{'FULL SCAN' if scanned else 'ok':<10} {name:<22} {elapsed:8.2f} ms")
+            for detail in details:
+                print(f"{'':<10}   {detail}")
+
+    await engine.dispose()
+    return 1 if full_scans else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--habits", type=int, default=20)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.users, args.habits, args.days)))
@@ -0,0 +1,106 @@
+"""
+Benchmark for recommendation retrieval on a large index.
+
+Builds a throwaway index of --chunks synthetic chunks (random sentence mixes
+from the bundled corpus) and times query embedding, exact search and IVF
+search at several nprobe values for single habit queries, reporting IVF
+recall@k against exact search.
+
+    python benchmarks/bench_retrieval.py [--chunks 100000] [--queries 200] [--k 10]
+"""
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent)
+sys.path.append(backend_dir)
+
+import numpy as np
+
+from app.core.config import settings
+from app.db.generate_data import HABIT_TEMPLATES
+from app.rag.chunking import Chunk, iter_corpus
+from app.rag.embeddings import EMBEDDERS, get_embedder
+from app.rag.index import VectorIndex, build_index
+from app.rag.retrieval import habit_query
+
+def synthetic_chunks(count: int, seed: int):
+    """
+    Chunk source of `count` chunks like those of a larger topical corpus:
+    3-6 sentences from one corpus section plus 1-2 from anywhere, under
+    that section's heading.
+    """
+    sections = {}
+    for chunk in iter_corpus(Path(settings.RAG_CORPUS_DIR)):
+        sections.setdefault(chunk.section, []).extend(re.split(r"(?<=[.!?])\s+", chunk.text))
+    headings = list(sections)
+    everything = [sentence for sentences in sections.values() for sentence in sentences]
+
+    def source():
+        rng = np.random.default_rng(seed)
+        for i in range(count):
+            heading = headings[rng.integers(len(headings))]
+            own = sections[heading]
+            picks = [own[p] for p in rng.choice(len(own), min(len(own), rng.integers(3, 7)), replace=False)]
+            picks += [everything[p] for p in rng.integers(len(everything), size=rng.integers(1, 3))]
+            yield Chunk(f"synthetic/{i // 1000}.md", heading, " ".join(picks))
+    return source
+
+def percentiles(samples):
+    values = np.array(samples) * 1e3
+    return f"p50 {np.percentile(values, 50):6.2f} ms  p95 {np.percentile(values, 95):6.2f} ms"
+
+def main(chunks: int, query_count: int, k: int, embedder_name: str, dim: int) -> None:
+    directory = Path(tempfile.mkdtemp()) / "index"
+    start = time.perf_counter()
+    build_index(synthetic_chunks(chunks, seed=1), directory, get_embedder(embedder_name, dim))
+    print(f"built {chunks} chunks ({embedder_name}, dim {dim}) in {time.perf_counter() - start:.1f}s")
+
+    index = VectorIndex(directory)
+    print(f"{index.lists} IVF lists, {index.vectors.nbytes / 2 ** 20:.0f} MiB of vectors\n")
+    rng = np.random.default_rng(2)
+    templates = [SimpleNamespace(**template) for template in HABIT_TEMPLATES]
+    texts = [habit_query(templates[i]) for i in rng.integers(len(templates), size=query_count)]
+
+    embed_times = []
+    queries = []
+    for text in texts:
+        began = time.perf_counter()
+        queries.append(index.embedder.embed([text]))
+        embed_times.append(time.perf_counter() - began)
+    print(f"{'embed query':<22} {percentiles(embed_times)}")
+
+    # Touch every page once so exact search is not timed against cold storage
+    index.search_exact(queries[0], k)
+    exact_times, exact_ids = [], []
+    for query in queries:
+        began = time.perf_counter()
+        exact_ids.append(index.search_exact(query, k)[1][0])
+        exact_times.append(time.perf_counter() - began)
+    print(f"{'exact':<22} {percentiles(exact_times)}")
+
+    if not index.lists:
+        return
+    for nprobe in (1, 4, 8, 16, 32):
+        times, hits = [], 0
+        for query, expected in zip(queries, exact_ids):
+            began = time.perf_counter()
+            found = index.search_ivf(query, k, nprobe)[1][0]
+            times.append(time.perf_counter() - began)
+            hits += len(np.intersect1d(found, expected))
+        print(f"{'ivf nprobe=' + str(nprobe):<22} {percentiles(times)}  recall@{k} {hits / (k * len(queries)):.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--embedder", choices=sorted(EMBEDDERS), default=settings.RAG_EMBEDDER)
+    parser.add_argument("--dim", type=int, default=settings.RAG_EMBEDDING_DIM)
+    args = parser.parse_args()
+    main(args.chunks, args.queries, args.k, args.embedder, args.dim)
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Micro-benchmark for serializing one page of GET /api/habits.
+
+Compares the previous response path (ORM objects validated through
+HabitResponse with from_attributes, then jsonable_encoder + json.dumps as
+JSONResponse renders them) with Pydantic's direct JSON dump and with the
+current path (HabitResponse columns as rows, encoded by orjson).
+Query and serialization are timed separately.
+
+    python benchmarks/bench_serialization.py [--page-size 100] [--pages 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent)
+sys.path.append(backend_dir)
+
+# Never benchmark against the real database
+_db_file = os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_file}"
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+
+from app.api.routes.habits import HABIT_RESPONSE_COLUMNS
+from app.core.responses import ORJSONResponse
+from app.db.base import Base
+from app.db.session import engine, async_session
+from app.models.habit import Habit
+from app.models.user import User
+from app.schemas.habit import HabitResponse
+
+page_adapter = TypeAdapter(List[HabitResponse])
+
+def legacy_render(habits) -> bytes:
+    """Validate ORM objects into models, then encode as JSONResponse did"""
+    models = page_adapter.validate_python(habits, from_attributes=True)
+    return json.dumps(
+        jsonable_encoder(models), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+def pydantic_render(habits) -> bytes:
+    """Validate ORM objects into models and dump JSON from Pydantic's core"""
+    return page_adapter.dump_json(page_adapter.validate_python(habits, from_attributes=True))
+
+def rows_render(rows) -> bytes:
+    """Current list_habits path: column rows straight to orjson"""
+    return ORJSONResponse([row._asdict() for row in rows]).body
+
+async def seed(page_size: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_session() as db:
+        user = User(email="bench@example.com", full_name="Bench User", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        created = datetime(2024, 1, 1)
+        await db.execute(insert(Habit), [
+            {
+                "user_id": user.id,
+                "title": f"Habit {i}",
+                "description": "Read twenty pages before bed",
+                "frequency": ("daily", "weekly", "monthly")[i % 3],
+                "category": "Learning",
+                "time_of_day": "21:00",
+                "reminder_time": "20:45",
+                "streak": i % 17,
+                "longest_streak": i % 23,
+                "completed": i % 2 == 0,
+                "last_completed": created + timedelta(days=i, minutes=i),
+                "created_at": created + timedelta(hours=i),
+                "updated_at": created + timedelta(days=i),
+            }
+            for i in range(page_size)
+        ])
+        await db.commit()
+
+async def measure_query(label: str, statement, pages: int):
+    start = time.perf_counter()
+    for _ in range(pages):
+        async with async_session() as db:
+            result = await db.execute(statement)
+            page = result.scalars().all() if label == "orm" else result.all()
+    elapsed = time.perf_counter() - start
+    print(f"{'query (' + label + ')':<28} {elapsed / pages * 1e3:9.3f} ms/page")
+    return page
+
+def measure_render(label: str, render, page, pages: int) -> bytes:
+    start = time.perf_counter()
+    for _ in range(pages):
+        body = render(page)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / pages * 1e3:9.3f} ms/page  ({len(body)} bytes)")
+    return body
+
+async def main(page_size: int, pages: int) -> None:
+    engine.echo = False
+    await seed(page_size)
+    order = (Habit.created_at.desc(), Habit.id.desc())
+
+    orm_page = await measure_query("orm", select(Habit).order_by(*order), pages)
+    row_page = await measure_query("rows", select(*HABIT_RESPONSE_COLUMNS).order_by(*order), pages)
+
+    print(f"\nserializing {page_size} habits per page")
+    legacy = measure_render("before (validate + json)", legacy_render, orm_page, pages)
+    pydantic = measure_render("pydantic dump_json", pydantic_render, orm_page, pages)
+    current = measure_render("after (rows + orjson)", rows_render, row_page, pages)
+    assert json.loads(legacy) == json.loads(pydantic) == json.loads(current)
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.page_size, args.pages))
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Startup benchmark: cold worker start and first-request latency.
+
+Each run starts a fresh interpreter, as a new worker process would, and
+times importing the app, the lifespan startup and the first two
+authenticated GET /api/habits requests, with and without warm-up.
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = str(Path(__file__).parent.parent)
+sys.path.append(backend_dir)
+
+def child() -> None:
+    """Measure one cold start; runs in its own interpreter"""
+    start = time.perf_counter()
+    from fastapi.testclient import TestClient
+    from main import app
+    from app.core.security import create_access_token
+    imported = time.perf_counter()
+
+    timings = {"import_ms": (imported - start) * 1000}
+    with TestClient(app) as client:
+        timings["lifespan_ms"] = (time.perf_counter() - imported) * 1000
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench@example.com'})}"}
+        for name in ("first_request_ms", "second_request_ms"):
+            request_start = time.perf_counter()
+            response = client.get("/api/habits?limit=50", headers=headers)
+            timings[name] = (time.perf_counter() - request_start) * 1000
+            assert response.status_code == 200, response.text
+    print(json.dumps(timings))
+
+async def seed() -> None:
+    from sqlalchemy import insert
+
+    from app.db.base import Base
+    from app.db.session import engine, async_session
+    from app.models.habit import Habit
+    from app.models.user import User
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session() as db:
+        user = User(email="bench@example.com", full_name="Bench User", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        await db.execute(insert(Habit), [
+            {
+                "user_id": user.id,
+                "title": f"Habit {i}",
+                "description": "Stretch for five minutes",
+                "frequency": "daily",
+                "category": "Health",
+            }
+            for i in range(50)
+        ])
+        await db.commit()
+    await engine.dispose()
+
+def measure(label: str, env: dict, runs: int) -> None:
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", __file__, "--child"],
+            env=env, cwd=backend_dir, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    medians = {key: statistics.median(run[key] for run in results) for key in results[0]}
+    print(f"{label:<12} " + "  ".join(f"{key} {value:8.1f}" for key, value in medians.items()))
+
+def main(runs: int) -> None:
+    # Never benchmark against the real database
+    db_file = os.path.join(tempfile.mkdtemp(), "bench_startup.db")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{db_file}",
+        "RESET_ENGINE_ENABLED": "false",
+    }
+    os.environ.update(env)
+    asyncio.run(seed())
+
+    print(f"median of {runs} cold starts")
+    measure("no warm-up", {**env, "WARMUP_ENABLED": "false"}, runs)
+    measure("warm-up", {**env, "WARMUP_ENABLED": "true"}, runs)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+    else:
+        main(args.runs)
\ No newline at end of file
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import (
@@ -6,8 +8,36 @@ from fastapi.openapi.docs import (
 )
 from fastapi.openapi.utils import get_openapi
 
-from app.api.routes import auth, user, habits
+from app.api.routes import auth, user, habits, metrics, recommendations
 from app.core.config import settings
+from app.core.instrumentation import MetricsMiddleware
+from app.core.responses import ORJSONResponse
+from app.core.security import password_hasher
+from app.core.warmup import warm_up
+from app.db.session import dispose_engines
+from app.services.habit_events import habit_events
+from app.services.habit_recommendations import load_recommendation_cache, save_recommendation_cache
+from app.services.habit_reset import reset_engine
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up, restore the recommendation cache and start background workers on
+    startup; on shutdown stop them, save the cache and close pooled
+    connections.
+    """
+    if settings.WARMUP_ENABLED:
+        await warm_up(app)
+    load_recommendation_cache()
+    await habit_events.start()
+    if settings.RESET_ENGINE_ENABLED:
+        reset_engine.start()
+    yield
+    await reset_engine.stop()
+    await habit_events.stop()
+    password_hasher.shutdown()
+    save_recommendation_cache()
+    await dispose_engines()
 
 app = FastAPI(
     title="Atomic Habits API",
@@ -22,7 +52,9 @@ app = FastAPI(
     """,
     version="1.0.0",
     docs_url=None,
-    redoc_url=None
+    redoc_url=None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS with more specific settings
@@ -49,6 +81,10 @@ app.add_middleware(
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
+# Added last so it is the outermost middleware and times the whole request
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.METRICS_SERVER_TIMING)
+
 # Include routers
 app.include_router(
     auth.router,
@@ -68,6 +104,15 @@ app.include_router(
     tags=["habits"]
 )
 
+app.include_router(
+    recommendations.router,
+    prefix="/api/recommendations",
+    tags=["Recommendations"]
+)
+
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["Monitoring"])
+
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
@@ -115,5 +160,5 @@ async def redoc_html():
     )
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    from app.core.server import run
+    run()
\ No newline at end of file